@@ -30,6 +30,8 @@ from flask import Flask, Response, jsonify, request, render_template_string, mak
 from dotenv import load_dotenv
 import ccxt
 
+from utils_stats import decode_payload
+
 # =========================================================
 # ENV & CONSTANTS
 # =========================================================
@@ -139,8 +141,7 @@ def _read_stats_file():
     # אם הבוט שלך כותב לכאן, הדשבורד יציג; אחרת יוצגו אפסים.
     try:
         if STATS_FILE.exists():
-            with STATS_FILE.open("r", encoding="utf-8") as f:
-                data = json.load(f)
+            data = decode_payload(STATS_FILE.read_bytes())  # JSON או msgpack (DOGE_STATS_FORMAT)
             if isinstance(data, dict):
                 return data
     except Exception as e:
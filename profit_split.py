@@ -10,8 +10,10 @@ persistence and supports configurable split ratios.
 Features:
 - Configurable chunk size for profit splitting (default 4 USD)
 - Flexible split ratio between BNB and reinvestment (default 50/50)
+- Integer micro-USD accounting to avoid float drift across many events
 - Automatic BNB market purchases when minimum cost is reached
 - Thread-safe state management with file locking
+- Hot counters and cold statistics persisted to separate files
 - Comprehensive statistics tracking
 
 Configuration via environment variables:
@@ -23,12 +25,26 @@ Configuration via environment variables:
 from __future__ import annotations
 
 import contextlib
+import functools
+import gc
 import json
 import os
 import pathlib
 import time
-from dataclasses import asdict, dataclass
-from typing import Any, Dict
+from dataclasses import dataclass, fields
+from typing import Any, Dict, Optional, Tuple
+
+# Optional fast JSON encoder (falls back to stdlib json)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Optional binary format for the split files (DOGE_STATS_FORMAT=msgpack)
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
 
 # Import utils_stats for tracking actual splits
 try:
@@ -43,16 +59,56 @@ except ImportError:
 SPLIT_CHUNK_USD = float(os.getenv("SPLIT_CHUNK_USD", "4.0"))
 SPLIT_RATIO = float(os.getenv("SPLIT_RATIO", "0.5"))  # 0.5 = 50% to BNB, 50% to reinvest
 BNB_SYMBOL = os.getenv("BNB_SYMBOL", "BNB/USDT")
+MARKET_REFRESH_SEC = float(os.getenv("SPLIT_MARKET_REFRESH_SEC", "3600"))
 
 # File system paths
 DATA_DIR = pathlib.Path.home() / "doge_bot" / "data"
 DATA_DIR.mkdir(parents=True, exist_ok=True)
 STATE_FILE_PATH = DATA_DIR / "split_state.json"
-SCHEMA_VERSION = 1
+STATS_FILE_NAME = "split_stats.json"  # cold statistics, stored next to STATE_FILE_PATH
+SCHEMA_VERSION = 3
+
+# Monetary amounts are kept as integer micro-USD (1 USD = 1_000_000 micros)
+MICROS_PER_USD = 1_000_000
+
+# Schema v1 stored float USD fields; map them to their v2 micro-USD names
+_LEGACY_USD_FIELDS = {
+    "split_accumulator_usd": "split_accumulator_micros",
+    "bnb_pending_usd": "bnb_pending_micros",
+    "reinvest_pool_usd": "reinvest_pool_micros",
+    "total_sent_to_bnb_usd": "total_sent_to_bnb_micros",
+    "total_reinvested_usd": "total_reinvested_micros",
+    "min_cost_cache_usd": "min_cost_cache_micros",
+}
 
 # Cache settings
 MIN_COST_CACHE_DURATION = 60.0  # seconds
 
+# DOGE_JSON_PRETTY=1 writes indented JSON for humans; compact by default
+JSON_PRETTY = os.getenv("DOGE_JSON_PRETTY", "0") == "1"
+
+# DOGE_STATS_FORMAT=msgpack stores the split files as msgpack; reads detect either format
+STATS_FORMAT = os.getenv("DOGE_STATS_FORMAT", "json").strip().lower()
+
+# In-process market cache: (id(client), symbol) -> (min cost USD, fetch ts, market info)
+_MIN_COST_CACHE: Dict[Tuple[int, str], Tuple[float, float, Dict[str, Any]]] = {}
+
+# Last cold statistics read from / written to disk: (stats path, cold dict)
+_COLD_ON_DISK: Tuple[Optional[pathlib.Path], Dict[str, Any]] = (None, {})
+
+
+def _to_micros(amount_usd: float) -> int:
+    """Convert a USD amount to integer micro-USD (rounded to nearest)."""
+    return int(round(float(amount_usd) * MICROS_PER_USD))
+
+
+def _to_usd(amount_micros: int) -> float:
+    """Convert integer micro-USD back to a float USD amount."""
+    return amount_micros / MICROS_PER_USD
+
+
+SPLIT_CHUNK_MICROS = _to_micros(SPLIT_CHUNK_USD)
+
 
 @contextlib.contextmanager
 def file_lock(file_path: pathlib.Path):
@@ -85,35 +141,121 @@ def file_lock(file_path: pathlib.Path):
             pass  # File handle closed automatically
 
 
-@dataclass
+@dataclass(slots=True)
 class SplitState:
     """
     Data class representing the profit splitting state.
 
+    All monetary fields are integer micro-USD (see MICROS_PER_USD).
+    Hot fields change on every profit event and live in STATE_FILE_PATH;
+    cold fields (totals and caches) live in STATS_FILE_NAME and are only
+    rewritten when they change.
+
     Attributes:
         schema_version: State schema version for migrations
-        split_accumulator_usd: Accumulated profit not yet split (< chunk size)
-        bnb_pending_usd: USD amount pending BNB purchase
-        reinvest_pool_usd: USD amount available for reinvestment
-        total_sent_to_bnb_usd: Total USD converted to BNB (statistics)
-        total_reinvested_usd: Total USD reinvested (statistics)
+        split_accumulator_micros: Accumulated profit not yet split (< chunk size)
+        bnb_pending_micros: Amount pending BNB purchase
+        reinvest_pool_micros: Amount available for reinvestment
+        total_sent_to_bnb_micros: Total amount converted to BNB (statistics)
+        total_reinvested_micros: Total amount reinvested (statistics)
         last_update_ts: Timestamp of last state update
         last_action: Description of last action taken (for debugging)
-        min_cost_cache_usd: Cached minimum cost for BNB purchase
+        min_cost_cache_micros: Cached minimum cost for BNB purchase
         min_cost_cache_ts: Timestamp of cached minimum cost
     """
 
     schema_version: int = SCHEMA_VERSION
-    split_accumulator_usd: float = 0.0
-    bnb_pending_usd: float = 0.0
-    reinvest_pool_usd: float = 0.0
-    total_sent_to_bnb_usd: float = 0.0
-    total_reinvested_usd: float = 0.0
+    split_accumulator_micros: int = 0
+    bnb_pending_micros: int = 0
+    reinvest_pool_micros: int = 0
+    total_sent_to_bnb_micros: int = 0
+    total_reinvested_micros: int = 0
     last_update_ts: float = 0.0
     last_action: str = ""
-    min_cost_cache_usd: float = 0.0
+    min_cost_cache_micros: int = 0
     min_cost_cache_ts: float = 0.0
 
+    def to_usd_dict(self) -> Dict[str, Any]:
+        """
+        Return the state with monetary fields as float USD.
+
+        Returns:
+            Dict[str, Any]: State using the legacy ``*_usd`` field names
+        """
+        return {
+            "schema_version": self.schema_version,
+            "split_accumulator_usd": _to_usd(self.split_accumulator_micros),
+            "bnb_pending_usd": _to_usd(self.bnb_pending_micros),
+            "reinvest_pool_usd": _to_usd(self.reinvest_pool_micros),
+            "total_sent_to_bnb_usd": _to_usd(self.total_sent_to_bnb_micros),
+            "total_reinvested_usd": _to_usd(self.total_reinvested_micros),
+            "last_update_ts": self.last_update_ts,
+            "last_action": self.last_action,
+            "min_cost_cache_usd": _to_usd(self.min_cost_cache_micros),
+            "min_cost_cache_ts": self.min_cost_cache_ts,
+        }
+
+
+# Known SplitState field names; unknown keys in stored state are ignored on load
+_FIELDS = frozenset(f.name for f in fields(SplitState))
+
+# Fields rewritten on every save; everything else is cold statistics/cache
+_HOT_FIELDS = (
+    "schema_version",
+    "split_accumulator_micros",
+    "bnb_pending_micros",
+    "reinvest_pool_micros",
+    "last_update_ts",
+    "last_action",
+)
+_COLD_FIELDS = ("schema_version",) + tuple(
+    f.name for f in fields(SplitState) if f.name not in _HOT_FIELDS
+)
+
+
+def _compile_to_dict(func_name: str, field_names: Tuple[str, ...]):
+    """
+    Generate a serializer returning a dict literal of the given SplitState fields.
+
+    Args:
+        func_name: Name for the generated function
+        field_names: SplitState attributes to include, in order
+
+    Returns:
+        Callable[[SplitState], Dict[str, Any]]: Straight-line serializer
+
+    Note:
+        The schema is fixed at import, so the generated function avoids the
+        reflection asdict() does on every call.
+    """
+    items = ", ".join(f"{name!r}: state.{name}" for name in field_names)
+    source = f"def {func_name}(state):\n    return {{{items}}}\n"
+    namespace: Dict[str, Any] = {}
+    exec(compile(source, f"<profit_split.{func_name}>", "exec"), namespace)
+    return namespace[func_name]
+
+
+_hot_to_dict = _compile_to_dict("_hot_to_dict", _HOT_FIELDS)
+_cold_to_dict = _compile_to_dict("_cold_to_dict", _COLD_FIELDS)
+
+
+def _dumps(data: Dict[str, Any]) -> bytes:
+    """
+    Serialize state data to UTF-8 JSON bytes.
+
+    Args:
+        data: Data dictionary to serialize
+
+    Returns:
+        bytes: Compact JSON document (indented when JSON_PRETTY is set),
+               or msgpack when DOGE_STATS_FORMAT=msgpack
+    """
+    if STATS_FORMAT == "msgpack" and msgpack is not None:
+        return msgpack.packb(data, use_bin_type=True)
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if JSON_PRETTY else 0)
+    return json.dumps(data, ensure_ascii=False, indent=2 if JSON_PRETTY else None).encode("utf-8")
+
 
 def _write_state_atomically(file_path: pathlib.Path, data: Dict[str, Any]) -> None:
     """
@@ -122,55 +264,121 @@ def _write_state_atomically(file_path: pathlib.Path, data: Dict[str, Any]) -> No
     Args:
         file_path: Path to write to
         data: Data dictionary to write
+
+    Note:
+        Writes the encoded bytes straight to a raw file descriptor, skipping
+        the text/buffered IO wrappers of open().
     """
     temp_file = file_path.with_suffix(file_path.suffix + ".tmp")
+    payload = memoryview(_dumps(data))
 
-    with open(temp_file, "w", encoding="utf-8") as file:
-        json.dump(data, file, ensure_ascii=False, indent=2)
+    fd = os.open(temp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        while payload:
+            payload = payload[os.write(fd, payload):]
+    finally:
+        os.close(fd)
 
     os.replace(temp_file, file_path)
 
 
+def _stats_file_path() -> pathlib.Path:
+    """Return the cold statistics file that sits next to STATE_FILE_PATH."""
+    return STATE_FILE_PATH.with_name(STATS_FILE_NAME)
+
+
+def _read_json_dict(file_path: pathlib.Path) -> Dict[str, Any]:
+    """
+    Read a JSON object from file.
+
+    Args:
+        file_path: Path to read from
+
+    Returns:
+        Dict[str, Any]: Parsed object, or an empty dict if missing or not an object
+    """
+    try:
+        raw = file_path.read_bytes()
+    except FileNotFoundError:
+        return {}
+
+    if raw and raw[0] >= 0x80 and msgpack is not None:  # msgpack map; JSON starts with ASCII
+        data = msgpack.unpackb(raw, raw=False)
+    else:
+        data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+    return data if isinstance(data, dict) else {}
+
+
 def _load_state() -> SplitState:
     """
-    Load the profit split state from file.
+    Load the profit split state from the hot state and cold statistics files.
 
     Returns:
-        SplitState: Current state or default state if file doesn't exist
+        SplitState: Current state or default state if files don't exist
+
+    Note:
+        Pre-v3 files kept every field in STATE_FILE_PATH; those are still read
+        and the cold fields move to the statistics file on the next save.
     """
-    if not STATE_FILE_PATH.exists():
+    global _COLD_ON_DISK
+    stats_path = _stats_file_path()
+
+    if not STATE_FILE_PATH.exists() and not stats_path.exists():
         return SplitState()
 
     try:
         with file_lock(STATE_FILE_PATH):
-            with open(STATE_FILE_PATH, "r", encoding="utf-8") as file:
-                data = json.load(file)
+            data = _read_json_dict(STATE_FILE_PATH)
+            cold_data = _read_json_dict(stats_path)
+
+        data.update(cold_data)
 
-        if isinstance(data, dict):
+        if data:
+            # Migrate v1 float USD fields to integer micro-USD
+            for legacy_key, micros_key in _LEGACY_USD_FIELDS.items():
+                if legacy_key in data:
+                    data[micros_key] = _to_micros(data.pop(legacy_key) or 0.0)
             # Ensure schema version is current
             data["schema_version"] = SCHEMA_VERSION
-            return SplitState(**data)
-    except (json.JSONDecodeError, TypeError, OSError):
+            state = SplitState(**{k: v for k, v in data.items() if k in _FIELDS})
+            _COLD_ON_DISK = (stats_path, _cold_to_dict(state)) if cold_data else (None, {})
+            return state
+    except (ValueError, TypeError, OSError):
+        # ValueError covers JSONDecodeError and msgpack's decode errors;
+        # TypeError a field of the wrong type. Either way start from defaults.
         pass
 
     return SplitState()
 
 
-def _save_state(state: SplitState) -> None:
+def _save_state(state: SplitState, now: Optional[float] = None) -> None:
     """
     Save the profit split state to file.
 
     Args:
         state: State object to save
+        now: Update timestamp to record (defaults to the current time)
+
+    Note:
+        The hot state file is always rewritten; the cold statistics file only
+        when its contents differ from what is already on disk.
     """
+    global _COLD_ON_DISK
     state.schema_version = SCHEMA_VERSION
-    state.last_update_ts = time.time()
+    state.last_update_ts = time.time() if now is None else now
+    stats_path = _stats_file_path()
+    cold_data = _cold_to_dict(state)
 
     with file_lock(STATE_FILE_PATH):
-        _write_state_atomically(STATE_FILE_PATH, asdict(state))
+        _write_state_atomically(STATE_FILE_PATH, _hot_to_dict(state))
+        if _COLD_ON_DISK != (stats_path, cold_data):
+            _write_state_atomically(stats_path, cold_data)
+            _COLD_ON_DISK = (stats_path, cold_data)
 
 
-def _get_minimum_cost(exchange_client, symbol: str, fallback: float = 10.0) -> float:
+def _get_minimum_cost(
+    exchange_client, symbol: str, fallback: float = 10.0, now: Optional[float] = None
+) -> float:
     """
     Get the minimum cost for trading a symbol, with caching.
 
@@ -178,41 +386,74 @@ def _get_minimum_cost(exchange_client, symbol: str, fallback: float = 10.0) -> f
         exchange_client: CCXT exchange client
         symbol: Trading symbol to check
         fallback: Fallback value if lookup fails
+        now: Current timestamp (defaults to the current time)
 
     Returns:
         float: Minimum cost in USD
 
     Note:
         Caches the result for MIN_COST_CACHE_DURATION seconds to reduce API calls.
+        The CCXT market object itself is kept in-process for MARKET_REFRESH_SEC
+        seconds, so expired min-cost entries are recomputed without a lookup.
     """
     state = _load_state()
-    current_time = time.time()
+    current_time = time.time() if now is None else now
 
     # Use cached value if available and fresh
     if (
-        state.min_cost_cache_usd > 0
+        state.min_cost_cache_micros > 0
         and current_time - state.min_cost_cache_ts < MIN_COST_CACHE_DURATION
     ):
-        return state.min_cost_cache_usd
+        return _to_usd(state.min_cost_cache_micros)
+
+    cache_key = (id(exchange_client), symbol)
+    cached = _MIN_COST_CACHE.get(cache_key)
 
     try:
-        exchange_client.load_markets()
-        market_info = exchange_client.market(symbol)
+        if cached is not None and current_time - cached[1] < MARKET_REFRESH_SEC:
+            market_info, fetched_ts = cached[2], cached[1]
+        else:
+            exchange_client.load_markets()
+            market_info, fetched_ts = exchange_client.market(symbol), current_time
+
         limits = market_info.get("limits", {}).get("cost", {})
         minimum_cost = limits.get("min")
 
         value = float(minimum_cost) if minimum_cost else fallback
+        _MIN_COST_CACHE[cache_key] = (value, fetched_ts, market_info)
     except Exception:
         value = fallback
 
     # Update cache
-    state.min_cost_cache_usd = value
+    state.min_cost_cache_micros = _to_micros(value)
     state.min_cost_cache_ts = current_time
-    _save_state(state)
+    _save_state(state, current_time)
 
     return value
 
 
+def _cached_minimum_cost_micros(
+    state: SplitState, exchange_client, symbol: str
+) -> Optional[int]:
+    """
+    Return an already known minimum cost without touching the exchange.
+
+    Args:
+        state: Loaded split state (for the persisted min-cost cache)
+        exchange_client: CCXT exchange client (in-process cache key)
+        symbol: Trading symbol
+
+    Returns:
+        Optional[int]: Minimum cost in micro-USD, or None if never looked up
+    """
+    cached = _MIN_COST_CACHE.get((id(exchange_client), symbol))
+    if cached is not None:
+        return _to_micros(cached[0])
+    if state.min_cost_cache_micros > 0:
+        return state.min_cost_cache_micros
+    return None
+
+
 def handle_realized_profit(profit_usd: float, exchange_client) -> Dict[str, Any]:
     """
     Process realized profit by splitting into chunks for BNB and reinvestment.
@@ -232,30 +473,30 @@ def handle_realized_profit(profit_usd: float, exchange_client) -> Dict[str, Any]
     if profit_usd <= 0:
         return result
 
+    now = time.time()
     state = _load_state()
-    state.split_accumulator_usd += float(profit_usd)
+    state.split_accumulator_micros += _to_micros(profit_usd)
 
-    # Calculate complete chunks
-    chunk_size = SPLIT_CHUNK_USD
-    complete_chunks = int(state.split_accumulator_usd // chunk_size)
-    remainder = state.split_accumulator_usd - complete_chunks * chunk_size
+    # Calculate complete chunks (exact integer arithmetic)
+    chunk_micros = SPLIT_CHUNK_MICROS
+    complete_chunks, remainder = divmod(state.split_accumulator_micros, chunk_micros)
 
     if complete_chunks > 0:
         # Split chunks between BNB and reinvestment
-        bnb_per_chunk = chunk_size * SPLIT_RATIO
-        reinvest_per_chunk = chunk_size - bnb_per_chunk
+        bnb_per_chunk = int(round(chunk_micros * SPLIT_RATIO))
+        reinvest_per_chunk = chunk_micros - bnb_per_chunk
 
         total_to_bnb = bnb_per_chunk * complete_chunks
         total_to_reinvest = reinvest_per_chunk * complete_chunks
 
         # Update state
-        state.bnb_pending_usd += total_to_bnb
-        state.reinvest_pool_usd += total_to_reinvest
-        state.split_accumulator_usd = remainder
+        state.bnb_pending_micros += total_to_bnb
+        state.reinvest_pool_micros += total_to_reinvest
+        state.split_accumulator_micros = remainder
 
         # Update result
         result["chunks"] = complete_chunks
-        result["reinvest_added_usd"] = total_to_reinvest
+        result["reinvest_added_usd"] = _to_usd(total_to_reinvest)
 
         # Track actual splits in statistics
         try:
@@ -266,16 +507,23 @@ def handle_realized_profit(profit_usd: float, exchange_client) -> Dict[str, Any]
 
         state.last_action = (
             f"chunked: +{complete_chunks} chunks "
-            f"(bnb+={total_to_bnb:.2f}, reinv+={total_to_reinvest:.2f})"
+            f"(bnb+={_to_usd(total_to_bnb):.2f}, reinv+={_to_usd(total_to_reinvest):.2f})"
         )
     else:
         state.last_action = f"accumulate: +{profit_usd:.4f} (pending chunk)"
 
+        # Fast path: nothing was chunked and pending BNB is still below the
+        # known minimum cost, so skip the min-cost lookup and ticker calls
+        known_minimum = _cached_minimum_cost_micros(state, exchange_client, BNB_SYMBOL)
+        if known_minimum is not None and state.bnb_pending_micros < known_minimum:
+            _save_state(state, now)
+            return result
+
     # Attempt to buy BNB if we have enough pending
-    minimum_cost = _get_minimum_cost(exchange_client, BNB_SYMBOL, fallback=10.0)
+    minimum_cost = _get_minimum_cost(exchange_client, BNB_SYMBOL, fallback=10.0, now=now)
 
-    if state.bnb_pending_usd >= minimum_cost:
-        usd_to_spend = state.bnb_pending_usd
+    if state.bnb_pending_micros >= _to_micros(minimum_cost):
+        usd_to_spend = _to_usd(state.bnb_pending_micros)
 
         try:
             # Get current BNB price
@@ -290,7 +538,7 @@ def handle_realized_profit(profit_usd: float, exchange_client) -> Dict[str, Any]
 
             if precise_quantity > 0:
                 # Place market buy order
-                client_order_id = f"SPLITBNB-{int(time.time())}"
+                client_order_id = f"SPLITBNB-{int(now)}"
                 exchange_client.create_order(
                     BNB_SYMBOL,
                     "market",
@@ -301,15 +549,15 @@ def handle_realized_profit(profit_usd: float, exchange_client) -> Dict[str, Any]
                 )
 
                 # Update state
-                state.total_sent_to_bnb_usd += usd_to_spend
-                state.bnb_pending_usd = 0.0
+                state.total_sent_to_bnb_micros += state.bnb_pending_micros
+                state.bnb_pending_micros = 0
                 result["bnb_bought_usd"] = usd_to_spend
 
                 state.last_action = f"BNB market buy ~${usd_to_spend:.2f} (qty≈{precise_quantity})"
         except Exception as e:
             state.last_action = f"BNB buy failed: {e}"
 
-    _save_state(state)
+    _save_state(state, now)
     return result
 
 
@@ -330,15 +578,36 @@ def pull_reinvestment_funds(max_amount_usd: float) -> float:
         return 0.0
 
     state = _load_state()
-    amount_to_pull = min(state.reinvest_pool_usd, float(max_amount_usd))
+    micros_to_pull = min(state.reinvest_pool_micros, _to_micros(max_amount_usd))
 
-    if amount_to_pull > 0:
-        state.reinvest_pool_usd -= amount_to_pull
-        state.total_reinvested_usd += amount_to_pull
-        state.last_action = f"reinvest pulled {amount_to_pull:.2f}"
+    if micros_to_pull > 0:
+        state.reinvest_pool_micros -= micros_to_pull
+        state.total_reinvested_micros += micros_to_pull
+        state.last_action = f"reinvest pulled {_to_usd(micros_to_pull):.2f}"
         _save_state(state)
 
-    return float(amount_to_pull)
+    return _to_usd(micros_to_pull)
+
+
+def _file_version(path: pathlib.Path) -> Optional[Tuple[int, int, int]]:
+    """On-disk version of a file as (mtime_ns, inode, size), or None if missing."""
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_ino, st.st_size)
+
+
+@functools.lru_cache(maxsize=8)
+def _state_usd_view(state_path: pathlib.Path, hot_version: Any, cold_version: Any) -> Dict[str, Any]:
+    """
+    USD view of the split state for the given on-disk file versions.
+
+    Note:
+        The arguments only form the cache key: any write (from this or another
+        process) changes a version, so the cache invalidates itself.
+    """
+    return _load_state().to_usd_dict()
 
 
 def get_current_state() -> Dict[str, Any]:
@@ -346,9 +615,16 @@ def get_current_state() -> Dict[str, Any]:
     Get the current profit split state as a dictionary.
 
     Returns:
-        Dict[str, Any]: Current state data
+        Dict[str, Any]: Current state data with monetary fields in float USD
+
+    Note:
+        Parsed results are cached per (mtime, inode, size) of the hot and cold
+        files, so frequent pollers (dashboard, CLI status) pay two stat calls
+        instead of a file read and JSON parse while nothing has changed.
     """
-    return asdict(_load_state())
+    state_path = STATE_FILE_PATH
+    view = _state_usd_view(state_path, _file_version(state_path), _file_version(_stats_file_path()))
+    return dict(view)
 
 
 def handle_profit(profit_usd: float, exchange_client) -> Dict[str, Any]:
@@ -375,6 +651,19 @@ def read_state() -> Dict[str, Any]:
     return get_current_state()
 
 
+def freeze_globals() -> None:
+    """
+    Move all objects allocated so far into the GC permanent generation.
+
+    Note:
+        Intended to be called once by a long-running entry point after startup,
+        so module globals and config are no longer traversed by later
+        collections. Not called on import to avoid affecting other importers.
+    """
+    gc.collect()
+    gc.freeze()
+
+
 def main() -> None:
     """Command-line interface for checking split state."""
     import sys
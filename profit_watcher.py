@@ -10,7 +10,7 @@ Sidecar שמחשב רווח ממומש (FIFO) מטריידים בבינאנס ו
 - backfill היסטורי (אופציונלי)
 - לופ "חי" שממשיך למשוך טריידים חדשים
 - מחשוב רווח ממומש (כולל עמלות לשני הצדדים)
-- עדכון dashboard דרך utils_stats.add_realized_profit
+- עדכון dashboard דרך utils_stats.add_realized_profit (מאוחד ונכתב ע"י thread רקע)
 - עדכון מנגנון החלוקה (BNB/רה-אינבסט) דרך profit_split.handle_profit
 - **NEW**: סנכרון bnb_converted_usd ב-dashboard לפי profit_split.state.json
 
@@ -24,22 +24,30 @@ from __future__ import annotations
 
 import os
 import time
-import json
+import asyncio
 import math
 import pathlib
 import argparse
 import threading
-from typing import List, Dict, Any, Optional, Tuple
+from bisect import insort
+from collections import deque
+from typing import Deque, List, Dict, Any, Optional, Tuple
 
 from dotenv import load_dotenv
 
+try:
+    from sortedcontainers import SortedKeyList
+except ImportError:  # בלעדיו הבאפר הוא list ממוין עם bisect.insort
+    SortedKeyList = None
+
 # === טעינת ENV מהפרויקט ===
 ENV_FILE = os.path.expanduser("~/doge_bot/.env")
 load_dotenv(ENV_FILE)
 
 import ccxt  # noqa: E402
-from utils_stats import add_realized_profit  # noqa: E402
-from profit_split import handle_profit, read_state as split_read_state  # ← נשתמש גם לקריאת total_sent_to_bnb_usd
+from utils import WEIGHT_MY_TRADES, WeightBucket, atomic_write_json, load_json_bytes  # noqa: E402
+from utils_stats import add_realized_profit, set_bnb_converted_usd  # noqa: E402
+from profit_split import handle_profit, freeze_globals, read_state as split_read_state  # ← נשתמש גם לקריאת total_sent_to_bnb_usd
 
 # === קונפיג כללי ===
 BINANCE_REGION = os.getenv("BINANCE_REGION", "com").strip().lower()
@@ -48,38 +56,12 @@ API_SECRET = os.getenv("BINANCE_TRADE_SECRET") or os.getenv("BINANCE_API_SECRET"
 RECV_WINDOW = int(os.getenv("BINANCE_RECVWINDOW", "10000"))
 PAIR = os.getenv("PAIR", "DOGE/USDT").strip()
 FEE_RATE_EACH_SIDE = float(os.getenv("FEE_RATE_EACH_SIDE", "0.001"))
+WS_MAX_FAILURES = int(os.getenv("WS_MAX_FAILURES", "5"))  # שגיאות stream רצופות עד מעבר ל-REST polling
 
 DATA_DIR = pathlib.Path.home() / "doge_bot" / "data"
 DATA_DIR.mkdir(parents=True, exist_ok=True)
 STATE_FILE = DATA_DIR / "profit_watcher_state.json"
 
-# === נתיב קובץ הסטטוס שהדשבורד קורא ===
-STATS_FILE = DATA_DIR / "runtime_stats.json"
-_STATS_LOCK = threading.Lock()
-
-
-def _load_stats() -> Dict[str, Any]:
-    try:
-        if STATS_FILE.exists():
-            return json.loads(STATS_FILE.read_text(encoding="utf-8"))
-    except Exception:
-        pass
-    # מבנה ברירת מחדל שתואם ל-/api/stats בדאשבורד
-    return {
-        "cumulative_profit_usd": 0.0,
-        "splits_count": 0,
-        "bnb_converted_usd": 0.0,
-    }
-
-
-def _set_bnb_converted_usd(abs_total_usd: float) -> None:
-    """מעדכן את השדה bnb_converted_usd בקובץ הסטטוס לערך מוחלט (לא הוספה דלתאית)."""
-    with _STATS_LOCK:
-        st = _load_stats()
-        st["bnb_converted_usd"] = float(abs_total_usd)
-        STATS_FILE.write_text(json.dumps(st, ensure_ascii=False), encoding="utf-8")
-
-
 def make_client():
     """יוצר מחבר CCXT בהתאם לאזור (com/us) עם קצב מוגבל ו-sync זמן."""
     Cls = ccxt.binanceus if BINANCE_REGION == "us" else ccxt.binance
@@ -104,21 +86,38 @@ def make_client():
 
 # מחבר גלובלי לשימוש בכל הפונקציות
 ex = make_client()
+# תקציב ה-weight של Binance (1200/דקה) – myTrades עולה 10 לכל קריאה
+WEIGHT_BUCKET = WeightBucket()
 
 
 # === ניהול מצב ל-FIFO ===
+# המלאי נשמר בזיכרון כ-deque כדי ש-FIFO יסיר מהראש ב-O(1)
+# גרסה 2: last_trade_id נשמר כמספר שלם (בגרסה 1 – מחרוזת)
+# גרסה 3: המלאי נשמר בדיסק בעמודות {"qty": [...], "price": [...]} (SoA) – קובץ קטן יותר
+#          וסריקה רציפה ב-validate_data; בזיכרון נשאר deque של lots
+STATE_SCHEMA_VERSION = 3
+
+
 def _init_state() -> Dict[str, Any]:
-    return {"last_trade_id": None, "inventory": []}
+    return {"schema_version": STATE_SCHEMA_VERSION, "last_trade_id": None, "inventory": deque()}
+
+
+def _inventory_from_disk(inv: Any) -> Deque[Dict[str, float]]:
+    """עמודות (גרסה 3) או רשימת lots (גרסאות 1–2) → deque של lots."""
+    if isinstance(inv, dict):
+        return deque({"qty": q, "price": p} for q, p in zip(inv.get("qty") or [], inv.get("price") or []))
+    return deque(inv) if isinstance(inv, list) else deque()
 
 
 def read_state() -> Dict[str, Any]:
     try:
         if STATE_FILE.exists():
-            with STATE_FILE.open("r", encoding="utf-8") as f:
-                j = json.load(f)
+            j = load_json_bytes(STATE_FILE.read_bytes())
             if isinstance(j, dict):
-                if "inventory" not in j or not isinstance(j["inventory"], list):
-                    j["inventory"] = []
+                j["inventory"] = _inventory_from_disk(j.get("inventory"))
+                last_id = j.get("last_trade_id")
+                j["last_trade_id"] = int(last_id) if last_id not in (None, "") else None
+                j["schema_version"] = STATE_SCHEMA_VERSION
                 return j
     except Exception as e:
         print(f"[WARN] failed reading state: {e}")
@@ -126,10 +125,10 @@ def read_state() -> Dict[str, Any]:
 
 
 def write_state(s: Dict[str, Any]) -> None:
-    tmp = STATE_FILE.with_suffix(".json.tmp")
-    with tmp.open("w", encoding="utf-8") as f:
-        json.dump(s, f, ensure_ascii=False)
-    tmp.replace(STATE_FILE)
+    out = dict(s)
+    inv = s.get("inventory") or ()
+    out["inventory"] = {"qty": [lot["qty"] for lot in inv], "price": [lot["price"] for lot in inv]}
+    atomic_write_json(STATE_FILE, out)
 
 
 # === חישוב רווח ממומש (כולל עמלות לשני הצדדים) ===
@@ -140,44 +139,66 @@ def realized_profit_on_match(buy_price: float, sell_price: float, qty: float,
     return float(gross - fees)
 
 
-def fifo_match_sell(inventory: List[Dict[str, float]], sell_price: float, qty: float,
+def fifo_match_sell(inventory: Deque[Dict[str, float]], sell_price: float, qty: float,
                     fee_rate_each_side: float) -> Tuple[float, float]:
     """
     משדך SELL מול מלאי קיים (FIFO). מחזיר:
     - realized (USD)
     - matched qty (כמה כמות נמכרה בפועל ממלאי)
     """
+    # הנוסחה של realized_profit_on_match משובצת בלולאה (בלי קריאת פונקציה לכל לוט)
     remaining = qty
     realized = 0.0
+    popleft = inventory.popleft
     while remaining > 1e-12 and inventory:
         lot = inventory[0]
-        take = min(remaining, lot["qty"])
-        realized += realized_profit_on_match(lot["price"], sell_price, take, fee_rate_each_side)
-        lot["qty"] -= take
+        lot_qty = lot["qty"]
+        buy_price = lot["price"]
+        take = remaining if remaining < lot_qty else lot_qty
+        realized += (sell_price - buy_price) * take - (buy_price * take + sell_price * take) * fee_rate_each_side
+        lot_qty -= take
         remaining -= take
-        if lot["qty"] <= 1e-12:
-            inventory.pop(0)
+        if lot_qty <= 1e-12:
+            popleft()
+        else:
+            lot["qty"] = lot_qty
     matched = qty - remaining
     return realized, matched
 
 
 # === שליפת טריידים מהבורסה (with normalize/sort) ===
+def _id_int(t: Dict[str, Any]) -> int:
+    """מזהה הטרייד כמספר שלם – מחושב פעם אחת ונשמר ב-t["_id_int"]."""
+    tid = t.get("_id_int")
+    if tid is None:
+        tid = t["_id_int"] = int(t.get("id") or 0)
+    return tid
+
+
+def _trade_key(t: Dict[str, Any]) -> Tuple[int, int]:
+    return (int(t.get("timestamp") or 0), _id_int(t))
+
+
 def normalize_trades(trades: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    def key(t):
-        return (int(t.get("timestamp") or 0), str(t.get("id") or ""))
     trades = [t for t in trades if t and t.get("symbol") == PAIR]
-    trades.sort(key=key)
+    for t in trades:
+        t["_id_int"] = int(t.get("id") or 0)
+    trades.sort(key=_trade_key)
     return trades
 
 
-def fetch_trades_window(pair: str, since_ms: Optional[int] = None, limit: int = 1000) -> List[Dict[str, Any]]:
+def fetch_trades_window(pair: str, since_ms: Optional[int] = None, limit: int = 1000,
+                        normalize: bool = True) -> List[Dict[str, Any]]:
     params = {"recvWindow": RECV_WINDOW}
     if since_ms is not None:
         params["startTime"] = since_ms
     try:
         ts0 = ex.milliseconds()
+        WEIGHT_BUCKET.acquire(WEIGHT_MY_TRADES)
         trades = ex.fetch_my_trades(pair, limit=limit, params=params)
-        trades = normalize_trades(trades)
+        WEIGHT_BUCKET.sync(ex)
+        if normalize:
+            trades = normalize_trades(trades)
         print(f"[FETCH] got {len(trades)} trades (since={since_ms}) in {ex.milliseconds()-ts0}ms")
         return trades
     except Exception as e:
@@ -185,16 +206,47 @@ def fetch_trades_window(pair: str, since_ms: Optional[int] = None, limit: int =
         return []
 
 
+# === באפר ממוין לטריידים חיים ===
+# כל poll מחזיר ~500 טריידים שכמעט כולם כבר עובדו; במקום לסנן ולמיין את כולם
+# מחדש, מכניסים לבאפר (ממוין לפי (ts, id)) רק טריידים חדשים שטרם נראו.
+_trade_buf = SortedKeyList(key=_trade_key) if SortedKeyList is not None else []
+_trade_buf_ids: set = set()
+
+
+def _buffer_new_trades(trades: List[Dict[str, Any]], last_id: Optional[int]) -> List[Dict[str, Any]]:
+    """מוסיף לבאפר טריידים חדשים (אחרי last_id) ומחזיר את כל מה שממתין לעיבוד, לפי סדר."""
+    for t in _select_new_trades(trades, last_id):
+        tid = t.get("id")
+        if tid in _trade_buf_ids or t.get("symbol") != PAIR:
+            continue
+        _trade_buf_ids.add(tid)
+        if SortedKeyList is not None:
+            _trade_buf.add(t)
+        else:
+            insort(_trade_buf, t, key=_trade_key)
+    return list(_trade_buf)
+
+
+def _drop_buffered_trades(processed: List[Dict[str, Any]]) -> None:
+    """מסיר מהבאפר טריידים שעובדו, כדי שלא יגדל."""
+    for t in processed:
+        if t.get("id") in _trade_buf_ids:
+            _trade_buf_ids.discard(t.get("id"))
+            _trade_buf.remove(t)
+
+
 # === עיבוד רצף טריידים לחישוב רווח ממומש ו"ספליטים" ===
 def process_trades_sequence(trades: List[Dict[str, Any]], st: Dict[str, Any],
-                            fee_rate_each_side: float) -> Tuple[float, int, Optional[str]]:
-    inv = st.get("inventory", [])
+                            fee_rate_each_side: float) -> Tuple[float, int, Optional[int]]:
+    inv = st.get("inventory")
+    if not isinstance(inv, deque):
+        inv = deque(inv or [])
     realized_total = 0.0
     inc_sell_trades = 0  # Renamed from inc_splits for clarity - this counts sell trades, not actual profit splits
     last_id = st.get("last_trade_id")
 
     for t in trades:
-        tid = str(t.get("id") or "")
+        tid = _id_int(t)
         side = (t.get("side") or "").lower()
         price = float(t.get("price") or 0.0)
         amount = float(t.get("amount") or 0.0)
@@ -221,7 +273,7 @@ def _sync_bnb_converted_from_split_state():
     try:
         split_state = split_read_state()  # קורא state.json של profit_split
         total_to_bnb = float(split_state.get("total_sent_to_bnb_usd", 0.0) or 0.0)
-        _set_bnb_converted_usd(total_to_bnb)
+        set_bnb_converted_usd(total_to_bnb)
         print(f"[SYNC] dashboard.bnb_converted_usd := {total_to_bnb:.2f}")
     except Exception as e:
         print(f"[SYNC][WARN] failed syncing bnb_converted_usd: {e}")
@@ -257,57 +309,80 @@ def do_backfill(st: Dict[str, Any], since_ms: int) -> Dict[str, Any]:
     return st
 
 
-# === לופ חי (polling) ===
-def live_tail_loop(st: Dict[str, Any], interval_sec: int):
+# === עזרים ללופ החי (polling / websocket) ===
+def _bootstrap_last_trade_id(st: Dict[str, Any]) -> None:
     # Bootstrap של last_trade_id (אם אין)
     if st.get("last_trade_id") is None:
         recent = fetch_trades_window(PAIR, since_ms=None, limit=1)
         if recent:
-            st["last_trade_id"] = str(recent[-1].get("id") or "")
+            st["last_trade_id"] = _id_int(recent[-1])
             write_state(st)
             print(f"[INIT] bootstrap last_trade_id={st['last_trade_id']}")
         else:
             print("[INIT] no trades found to bootstrap; waiting for first trade...")
 
+
+def _select_new_trades(trades: List[Dict[str, Any]], last_id: Optional[int]) -> List[Dict[str, Any]]:
+    if last_id is None:
+        return list(trades)
+    return [t for t in trades if _id_int(t) > last_id]
+
+
+def _apply_live_trades(st: Dict[str, Any], new_trades: List[Dict[str, Any]], source: str) -> None:
+    """מעבד טריידים חדשים (live/ws): רווח ממומש, דשבורד, חלוקה ושמירת מצב."""
+    last_id = st.get("last_trade_id")
+    realized, sell_trades, new_last_id = process_trades_sequence(new_trades, st, FEE_RATE_EACH_SIDE)
+    print(f"[{source.upper()}] processed {len(new_trades)} new trades | realized={realized:.6f} | sell_trades={sell_trades}")
+
+    # === עדכוני סטטוס + חלוקה ===
+    if abs(realized) > 1e-12 or sell_trades > 0:
+        # עדכון dashboard (מצטבר/ספירה)
+        add_realized_profit(realized, inc_sell_trades=sell_trades)
+        # עדכון מנגנון חלוקה (state.json + קניית BNB אם צריך)
+        if realized > 0:
+            try:
+                handle_profit(realized, ex)
+                print(f"[SPLIT] handle_profit(realized={realized:.6f}) done ({source}).")
+            except Exception as e:
+                print(f"[SPLIT][WARN] handle_profit failed ({source}): {e}")
+        # בכל מקרה נסנכרן את הסכום המצטבר שהועבר ל-BNB לדשבורד
+        _sync_bnb_converted_from_split_state()
+
+    st["last_trade_id"] = new_last_id or last_id
+    write_state(st)
+
+
+def _catch_up_rest(st: Dict[str, Any], source: str) -> None:
+    """משלים ב-REST טריידים שפוספסו (לפני הרשמה ל-stream ואחרי ניתוק) – ה-stream מעביר רק טריידים חדשים."""
+    all_trades = fetch_trades_window(PAIR, since_ms=None, limit=500, normalize=False)
+    new_trades = _buffer_new_trades(all_trades, st.get("last_trade_id"))
+    if new_trades:
+        _apply_live_trades(st, new_trades, source)
+        _drop_buffered_trades(new_trades)
+
+
+# === לופ חי (polling) ===
+def live_tail_loop(st: Dict[str, Any], interval_sec: int):
+    _bootstrap_last_trade_id(st)
+
     while True:
         try:
-            all_trades = fetch_trades_window(PAIR, since_ms=None, limit=500)
+            all_trades = fetch_trades_window(PAIR, since_ms=None, limit=500, normalize=False)
             if not all_trades:
                 print("[LIVE] no trades returned; sleeping...")
                 time.sleep(interval_sec)
                 continue
 
             last_id = st.get("last_trade_id")
-            new_trades = []
-            for t in all_trades:
-                tid = str(t.get("id") or "")
-                if last_id is None or tid > str(last_id):
-                    new_trades.append(t)
+            new_trades = _buffer_new_trades(all_trades, last_id)
 
             if not new_trades:
                 print(f"[LIVE] no new trades after id={last_id}; sleeping...")
                 time.sleep(interval_sec)
                 continue
 
-            realized, sell_trades, new_last_id = process_trades_sequence(new_trades, st, FEE_RATE_EACH_SIDE)
-            print(f"[LIVE] processed {len(new_trades)} new trades | realized={realized:.6f} | sell_trades={sell_trades}")
-
-            # === עדכוני סטטוס + חלוקה ===
-            if abs(realized) > 1e-12 or sell_trades > 0:
-                # עדכון dashboard (מצטבר/ספירה)
-                add_realized_profit(realized, inc_sell_trades=sell_trades)
-                # עדכון מנגנון חלוקה (state.json + קניית BNB אם צריך)
-                if realized > 0:
-                    try:
-                        handle_profit(realized, ex)
-                        print(f"[SPLIT] handle_profit(realized={realized:.6f}) done (live).")
-                    except Exception as e:
-                        print(f"[SPLIT][WARN] handle_profit failed (live): {e}")
-                # בכל מקרה נסנכרן את הסכום המצטבר שהועבר ל-BNB לדשבורד
-                _sync_bnb_converted_from_split_state()
-
-            st["last_trade_id"] = new_last_id or last_id
-            write_state(st)
+            _apply_live_trades(st, new_trades, "live")
+            _drop_buffered_trades(new_trades)
 
         except ccxt.AuthenticationError as e:
             print(f"[ERROR] Authentication failed: {e}; check API keys/permissions/region.")
@@ -317,6 +392,71 @@ def live_tail_loop(st: Dict[str, Any], interval_sec: int):
             time.sleep(interval_sec)
 
 
+# === לופ חי (websocket – user data stream) ===
+def make_ws_client():
+    """מחבר ccxt.pro (websocket) או None אם ccxt.pro לא זמין."""
+    try:
+        import ccxt.pro as ccxtpro
+    except ImportError:
+        return None
+    Cls = ccxtpro.binanceus if BINANCE_REGION == "us" else ccxtpro.binance
+    return Cls({
+        "apiKey": API_KEY,
+        "secret": API_SECRET,
+        "enableRateLimit": True,
+        "options": {"defaultType": "spot", "adjustForTimeDifference": True},
+    })
+
+
+async def _watch_trades_ws(wsx, st: Dict[str, Any]) -> bool:
+    """לופ ה-stream; מחזיר False אחרי WS_MAX_FAILURES שגיאות רצופות (ואז חוזרים ל-REST)."""
+    failures = 0
+    try:
+        while True:
+            try:
+                trades = await wsx.watch_my_trades(PAIR)
+                failures = 0
+                new_trades = _buffer_new_trades(trades, st.get("last_trade_id"))
+                if new_trades:
+                    _apply_live_trades(st, new_trades, "ws")
+                    _drop_buffered_trades(new_trades)
+            except ccxt.AuthenticationError:
+                raise
+            except Exception as e:
+                failures += 1
+                if failures >= WS_MAX_FAILURES:
+                    print(f"[WS][ERROR] stream error: {e}; {failures} failures in a row, falling back to REST polling.")
+                    return False
+                print(f"[WS][WARN] stream error: {e}; reconnecting...")
+                await asyncio.sleep(5)
+                # טריידים שבוצעו בזמן הניתוק לא יגיעו ב-stream
+                _catch_up_rest(st, "ws-catchup")
+    finally:
+        await wsx.close()
+
+
+def live_tail_ws(st: Dict[str, Any]) -> bool:
+    """
+    מאזין ל-executionReport דרך websocket (Binance user data stream) במקום polling.
+    מחזיר False אם ccxt.pro לא זמין, האימות נכשל או שה-stream נכשל WS_MAX_FAILURES פעמים ברצף –
+    ואז חוזרים ל-REST.
+    """
+    wsx = make_ws_client()
+    if wsx is None:
+        print("[WS] ccxt.pro not available; using REST polling.")
+        return False
+
+    _bootstrap_last_trade_id(st)
+    # טריידים שבוצעו בזמן שהתהליך היה למטה – ה-stream מעביר רק מה שנדחף אחרי ההרשמה
+    _catch_up_rest(st, "ws-catchup")
+    print("[WS] watching my trades via websocket...")
+    try:
+        return asyncio.run(_watch_trades_ws(wsx, st))
+    except ccxt.AuthenticationError as e:
+        print(f"[WS][ERROR] Authentication failed: {e}; falling back to REST polling.")
+        return False
+
+
 # === CLI ===
 def parse_args() -> argparse.Namespace:
     ap = argparse.ArgumentParser()
@@ -324,6 +464,7 @@ def parse_args() -> argparse.Namespace:
     ap.add_argument("--since-ms", type=int, default=None, help="backfill since ms (UNIX ms)")
     ap.add_argument("--since-days", type=int, default=None, help="backfill last N days (if --backfill given)")
     ap.add_argument("--loop-interval", type=int, default=5, help="seconds between live polls")
+    ap.add_argument("--no-ws", action="store_true", help="poll REST instead of the websocket user data stream")
     return ap.parse_args()
 
 
@@ -344,7 +485,11 @@ def main():
             since_ms = int(ex.milliseconds() - days * 24 * 60 * 60 * 1000)
         st = do_backfill(st, since_ms)
 
-    live_tail_loop(st, interval_sec=args.loop_interval)
+    # אובייקטי האתחול (קונפיג, מחבר, מצב) לא ייסרקו שוב ע"י ה-GC
+    freeze_globals()
+
+    if args.no_ws or not live_tail_ws(st):
+        live_tail_loop(st, interval_sec=args.loop_interval)
 
 
 if __name__ == "__main__":
@@ -1,11 +1,27 @@
 import time
 
-def _edge_hit(last_price: float, lower: float, upper: float, edge_pct: int) -> bool:
-    width = upper - lower
-    if width <= 0:
+def _edge_bounds(lower: float, upper: float, edge_pct: int, dwell_state: dict) -> tuple[float, float] | None:
+    """
+    ספי ה-edge (lower_edge, upper_edge) נשמרים ב-dwell_state ומחושבים מחדש רק כשהטווח/האחוז משתנים.
+    None אם רוחב הטווח לא חיובי.
+    """
+    key = (lower, upper, edge_pct)
+    if dwell_state.get("_bounds") != key:
+        width = upper - lower
+        if width <= 0:
+            edges = None
+        else:
+            edges = (lower + width * (edge_pct / 100.0), upper - width * (edge_pct / 100.0))
+        dwell_state["_bounds"] = key
+        dwell_state["_edges"] = edges
+    return dwell_state["_edges"]
+
+def _edge_hit(last_price: float, lower: float, upper: float, edge_pct: int,
+              dwell_state: dict | None = None) -> bool:
+    edges = _edge_bounds(lower, upper, edge_pct, {} if dwell_state is None else dwell_state)
+    if edges is None:
         return False
-    lower_edge = lower + width * (edge_pct / 100.0)
-    upper_edge = upper - width * (edge_pct / 100.0)
+    lower_edge, upper_edge = edges
     return (last_price <= lower_edge) or (last_price >= upper_edge)
 
 def need_recenter(last_price: float,
@@ -14,17 +30,20 @@ def need_recenter(last_price: float,
                   dwell_state: dict,
                   dwell_seconds: int = 600,
                   edge_pct: int = 90,
-                  center_drift_pct_of_width: int | None = None) -> bool:
+                  center_drift_pct_of_width: int | None = None,
+                  now: float | None = None) -> bool:
     """
     True אם צריך לבצע Recenter—או כי המחיר שוהה בשולי הטווח (edge) זמן מינימום,
     או כי סטיית המחיר מהמרכז חצתה אחוז מוגדר מרוחב הטווח.
     dwell_state: {"now": time.time(), "hit_since": Optional[float]}
+    now: זמן הסבב מהלולאה הקוראת (אם לא ניתן – dwell_state["now"] או time.time())
     """
-    now = dwell_state.get("now") or time.time()
+    if now is None:
+        now = dwell_state.get("now") or time.time()
     dwell_state["now"] = now
 
     # קריטריון 1: שולי טווח + שהייה (dwell)
-    hit = _edge_hit(last_price, lower, upper, edge_pct)
+    hit = _edge_hit(last_price, lower, upper, edge_pct, dwell_state)
     if hit:
         if dwell_state.get("hit_since") is None:
             dwell_state["hit_since"] = now
@@ -9,9 +9,11 @@ regrid.py — Cancel all open orders and (optionally) seed a new grid by range &
 """
 
 import os, sys, math, argparse, time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 from dotenv import load_dotenv
+import numpy as np
 
 # --------------------
 # Load env
@@ -20,6 +22,12 @@ ENV_FILE = os.path.expanduser("~/doge_bot/.env")
 load_dotenv(ENV_FILE)
 
 import ccxt
+from utils import WEIGHT_CANCEL, WEIGHT_OPEN_ORDERS, WEIGHT_PLACE, WeightBucket, ttl_cache
+
+PLACE_WORKERS = int(os.getenv("REGRID_PLACE_WORKERS", "8"))
+PLACE_MAX_RETRIES = 5
+# Shared by cancel and place calls so the whole run stays inside the weight budget
+WEIGHT_BUCKET = WeightBucket()
 
 def make_client():
     region = os.getenv("BINANCE_REGION","com").strip().lower()
@@ -62,43 +70,84 @@ def geometric_levels(pmin: float, pmax: float, step_pct: float) -> List[float]:
     if pmin <= 0 or pmax <= 0 or pmax <= pmin:
         return []
     r = 1.0 + (step_pct / 100.0)
-    levels = [pmin]
-    # avoid infinite loop if step too tiny
+    # avoid runaway level counts if step too tiny
     max_levels = 5000
-    while levels[-1] * r < pmax and len(levels) < max_levels:
-        levels.append(levels[-1] * r)
-    if levels[-1] != pmax:
-        levels.append(pmax)
-    # unique & sorted
-    uniq = sorted(set([round(x, 8) for x in levels]))
-    return uniq
-
-def lot_from_usd(ex: ccxt.Exchange, pair: str, price: float, usd: float) -> float:
+    if r <= 1.0:
+        n = max_levels
+    else:
+        # +2 covers log rounding; the extra levels are >= pmax and filtered out
+        n = min(math.ceil(math.log(pmax / pmin) / math.log(r)) + 2, max_levels)
+    # cumprod multiplies in order, so level i is bit-identical to i repeated *r steps
+    factors = np.full(n, r)
+    factors[0] = pmin
+    levels = np.cumprod(factors)
+    levels = levels[levels < pmax].tolist()
+    levels.append(pmax)
+    # unique & sorted; Python round() (np.round breaks ties differently)
+    return sorted(set([round(x, 8) for x in levels]))
+
+@ttl_cache(300.0)
+def _resolve_precision(ex: ccxt.Exchange, pair: str) -> Tuple[Optional[int], Optional[float]]:
     """
-    Convert USD amount to base-asset amount, rounded to exchange precision.
+    Look up amount precision (decimal places) and minimum amount for a pair once.
     """
-    if price <= 0: return 0.0
-    amt = usd / price
-    market = ex.markets.get(pair, {})
+    market = (ex.markets or {}).get(pair, {})
     prec = market.get("precision", {})
-    step = market.get("limits", {}).get("amount", {}).get("min")
-    # round by precision if exists
-    amount = amt
-    if "amount" in prec and isinstance(prec["amount"], int):
-        q = prec["amount"]
-        amount = float(f"{amt:.{q}f}")
-    # enforce min amount if exists
-    if step and amount < step:
-        amount = step
-    return amount
+    q = prec["amount"] if "amount" in prec and isinstance(prec["amount"], int) else None
+    min_step = market.get("limits", {}).get("amount", {}).get("min")
+    return q, min_step
+
+def _round_amounts(amt: np.ndarray, q: int) -> np.ndarray:
+    """
+    Round amounts to q decimals exactly like float(f"{a:.{q}f}").
+    np.round scales by 10**q first, so it can land on the other side of a tie;
+    values within reach of a tie are re-rounded with the string format.
+    """
+    out = np.round(amt, q)
+    scaled = amt * 10.0 ** q
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    for i in np.flatnonzero(near_tie):
+        out[i] = float(f"{amt[i]:.{q}f}")
+    return out
+
+def lot_from_usd_np(prices: np.ndarray, usd: float, q: Optional[int], min_step: Optional[float]) -> np.ndarray:
+    """
+    Convert a USD amount to base-asset amounts for a whole array of prices,
+    rounded to exchange precision (0.0 where price <= 0).
+    q / min_step come from _resolve_precision().
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        amt = np.where(prices > 0, usd / prices, 0.0)
+    if q is not None:
+        amt = _round_amounts(amt, q)
+    if min_step:
+        amt = np.where(prices > 0, np.maximum(amt, min_step), 0.0)
+    return amt
 
+@ttl_cache(2.0)
 def fetch_last_price(ex: ccxt.Exchange, pair: str) -> float:
     t = ex.fetch_ticker(pair)
     return float(t.get("last") or t.get("close") or t.get("bid") or t.get("ask") or 0.0)
 
+def cancel_all_bulk(ex: ccxt.Exchange, pair: str) -> bool:
+    """
+    Cancel every open order on pair in one request (Binance DELETE /api/v3/openOrders).
+    Returns False when the exchange lacks it or the call fails, so callers can fall back.
+    """
+    if not (getattr(ex, "has", None) or {}).get("cancelAllOrders"):
+        return False
+    try:
+        ex.cancel_all_orders(pair)
+        return True
+    except Exception as e:
+        print(f"[WARN] bulk cancel failed, falling back to per-order: {e}")
+        return False
+
 def cancel_all_open_orders(ex: ccxt.Exchange, pair: str):
     try:
+        WEIGHT_BUCKET.acquire(WEIGHT_OPEN_ORDERS)
         opens = ex.fetch_open_orders(pair)
+        WEIGHT_BUCKET.sync(ex)
     except Exception as e:
         print(f"[ERR] fetch_open_orders failed: {e}")
         return
@@ -106,16 +155,44 @@ def cancel_all_open_orders(ex: ccxt.Exchange, pair: str):
         print("[OK] No open orders to cancel.")
         return
     print(f"[INFO] Cancelling {len(opens)} open orders...")
+    if cancel_all_bulk(ex, pair):
+        print(f"[OK] Done cancelling ({len(opens)} orders in one request).")
+        return
     for o in opens:
         oid = o.get("id")
+        WEIGHT_BUCKET.acquire(WEIGHT_CANCEL)
         try:
             ex.cancel_order(oid, pair)
             print(f"  - cancelled {oid} ({o.get('side')} {o.get('price')})")
         except Exception as e:
             print(f"  ! cancel failed for {oid}: {e}")
-        time.sleep(ex.rateLimit/1000.0 if getattr(ex, "rateLimit", 0) else 0.1)
+        WEIGHT_BUCKET.sync(ex)
     print("[OK] Done cancelling.")
 
+def place_grid_order(ex: ccxt.Exchange, pair: str, side: str, price: float, amount: float) -> str:
+    """
+    Place one limit order, backing off exponentially on rate-limit errors.
+    Returns "" on success or the error text (printed later by the caller).
+    """
+    params = {"newClientOrderId": f"grid_{side}_{int(price*1e6)}"}
+    delay = 0.5
+    for attempt in range(PLACE_MAX_RETRIES):
+        WEIGHT_BUCKET.acquire(WEIGHT_PLACE)
+        try:
+            if side == "buy":
+                ex.create_limit_buy_order(pair, amount, price, params=params)
+            else:
+                ex.create_limit_sell_order(pair, amount, price, params=params)
+            return ""
+        except ccxt.RateLimitExceeded as e:
+            if attempt == PLACE_MAX_RETRIES - 1:
+                return str(e)
+            time.sleep(delay)
+            delay *= 2
+        except Exception as e:
+            return str(e)
+    return "retries exhausted"
+
 def seed_grid(ex: ccxt.Exchange, gp: GridParams, apply: bool):
     last = fetch_last_price(ex, gp.pair)
     if last <= 0:
@@ -127,17 +204,15 @@ def seed_grid(ex: ccxt.Exchange, gp: GridParams, apply: bool):
         print("[ERR] Not enough levels for grid (check min/max/step).")
         return
 
-    buys: List[Tuple[float,float]] = []   # (price, amount)
-    sells: List[Tuple[float,float]] = []
-
-    for px in levels:
-        if px < last:
-            amt = lot_from_usd(ex, gp.pair, px, gp.base_order_usd)
-            if amt > 0: buys.append((px, amt))
-        elif px > last:
-            amt = lot_from_usd(ex, gp.pair, px, gp.base_order_usd)
-            if amt > 0: sells.append((px, amt))
-        # if px == last -> skip exact midpoint
+    # Plan stage is pure array math; only the API calls below loop per order
+    q, min_step = _resolve_precision(ex, gp.pair)
+    prices = np.asarray(levels, dtype=np.float64)
+    amounts = lot_from_usd_np(prices, gp.base_order_usd, q, min_step)
+    ok = amounts > 0
+    buy_mask = ok & (prices < last)
+    sell_mask = ok & (prices > last)   # px == last -> skip exact midpoint
+    buys: List[Tuple[float,float]] = list(zip(prices[buy_mask].tolist(), amounts[buy_mask].tolist()))   # (price, amount)
+    sells: List[Tuple[float,float]] = list(zip(prices[sell_mask].tolist(), amounts[sell_mask].tolist()))
 
     print(f"\n[PLAN] Pair: {gp.pair} | last: {last:.6f}")
     print(f"[PLAN] Range: {gp.pmin:.6f} – {gp.pmax:.6f} | step: {gp.step_pct}%")
@@ -156,24 +231,17 @@ def seed_grid(ex: ccxt.Exchange, gp: GridParams, apply: bool):
         print("\n[NOTE] Dry preview only. Use --apply to place orders.")
         return
 
-    # Apply live
-    print("\n[APPLY] Placing BUY orders...")
-    for p, a in buys:
-        try:
-            ex.create_limit_buy_order(gp.pair, a, p, params={"newClientOrderId": f"grid_buy_{int(p*1e6)}"})
-            print(f"  + BUY {a} @ {p}")
-        except Exception as e:
-            print(f"  ! BUY {a} @ {p} failed: {e}")
-        time.sleep(ex.rateLimit/1000.0 if getattr(ex, "rateLimit", 0) else 0.2)
+    # Apply live: orders go out concurrently; WEIGHT_BUCKET keeps them inside the weight budget
+    tasks = [("buy", p, a) for p, a in buys] + [("sell", p, a) for p, a in sells]
+    print(f"\n[APPLY] Placing {len(buys)} BUY and {len(sells)} SELL orders ({PLACE_WORKERS} workers)...")
+    with ThreadPoolExecutor(max_workers=PLACE_WORKERS) as pool:
+        errors = list(pool.map(lambda t: place_grid_order(ex, gp.pair, *t), tasks))
 
-    print("[APPLY] Placing SELL orders...")
-    for p, a in sells:
-        try:
-            ex.create_limit_sell_order(gp.pair, a, p, params={"newClientOrderId": f"grid_sell_{int(p*1e6)}"})
-            print(f"  + SELL {a} @ {p}")
-        except Exception as e:
-            print(f"  ! SELL {a} @ {p} failed: {e}")
-        time.sleep(ex.rateLimit/1000.0 if getattr(ex, "rateLimit", 0) else 0.2)
+    for (side, p, a), err in zip(tasks, errors):
+        if err:
+            print(f"  ! {side.upper()} {a} @ {p} failed: {err}")
+        else:
+            print(f"  + {side.upper()} {a} @ {p}")
 
     print("\n[OK] Grid seeded.")
 
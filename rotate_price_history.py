@@ -10,63 +10,82 @@ rotate_price_history.py
 
 פרמטרים דרך ENV:
   ROTATE_KEEP_DAYS=7   (כמה ימים להשאיר בנוכחי)
+  ROTATE_WORKERS=0     (תהליכים לדחיסת gzip במקביל; 0 = לפי מספר הליבות)
+  ROTATE_GZIP_LEVEL=1  (רמת דחיסה; 1 = הכי מהיר)
 """
 
 from __future__ import annotations
-import os, json, gzip, datetime as dt, pathlib
+import os, gzip, datetime as dt, pathlib
+from concurrent.futures import ProcessPoolExecutor
+
+from utils import atomic_write_json, dump_json_bytes, load_json_bytes
+
+try:
+    import ijson  # קריאה זורמת – לא טוען את כל הקובץ לזיכרון
+except ImportError:
+    ijson = None
 
 KEEP_DAYS = int(os.getenv("ROTATE_KEEP_DAYS", "7"))
+WORKERS = int(os.getenv("ROTATE_WORKERS", "0")) or None
+GZIP_LEVEL = int(os.getenv("ROTATE_GZIP_LEVEL", "1"))
 
 DATA_DIR = pathlib.Path.home() / "doge_bot" / "data"
 SRC = DATA_DIR / "price_history.json"
 
-def _load_points():
+def _iter_points():
+    """מחזיר (t, p) לכל נקודה תקינה ב-price_history.json, בזרימה כשיש ijson."""
     if not SRC.exists():
-        return []
-    with open(SRC, "r", encoding="utf-8") as f:
-        j = json.load(f)
-    if not isinstance(j, list):
-        return []
-    out = []
-    for p in j:
-        try:
-            t = int(p.get("t"))
-            price = float(p.get("p"))
-            out.append((t, price))
-        except Exception:
-            continue
-    return out
-
-def _date_key(ms: int) -> str:
-    d = dt.datetime.utcfromtimestamp(ms/1000.0)
-    return d.strftime("%Y-%m-%d")
+        return
+    with open(SRC, "rb") as f:
+        if ijson is not None:
+            items = ijson.items(f, "item", use_float=True)
+        else:
+            j = load_json_bytes(f.read())
+            items = j if isinstance(j, list) else []
+        for p in items:
+            try:
+                yield int(p.get("t")), float(p.get("p"))
+            except Exception:
+                continue
+
+MS_PER_DAY = 86_400_000
+
+def _day_label(day_index: int) -> str:
+    """אינדקס יום (ms // MS_PER_DAY) → YYYY-MM-DD (UTC); נקרא פעם אחת לכל יום."""
+    return dt.datetime.utcfromtimestamp(day_index * 86400).strftime("%Y-%m-%d")
 
 def _write_day_file(day: str, rows: list[tuple[int,float]]) -> None:
     path = DATA_DIR / f"price_history-{day}.jsonl.gz"
-    with gzip.open(path, "wt", encoding="utf-8") as gz:
-        for t, p in rows:
-            gz.write(json.dumps({"t": t, "p": p}, ensure_ascii=False) + "\n")
+    # כל היום נבנה בזיכרון ונדחס בקריאה אחת (הקבצים נקראים לעתים רחוקות – מהירות על פני יחס דחיסה)
+    payload = b"".join(dump_json_bytes({"t": t, "p": p}) + b"\n" for t, p in rows)
+    path.write_bytes(gzip.compress(payload, compresslevel=GZIP_LEVEL))
 
 def main():
-    pts = _load_points()
-    if not pts:
+    # קיבוץ לפי יום (UTC) ישירות מהקריאה הזורמת – מפתח שלם, בלי datetime לכל נקודה
+    by_day: dict[int, list[tuple[int,float]]] = {}
+    for t, p in _iter_points():
+        by_day.setdefault(t // MS_PER_DAY, []).append((t, p))
+
+    if not by_day:
         print("[i] no points to rotate.")
         return
 
-    # קיבוץ לפי יום (UTC)
-    by_day: dict[str, list[tuple[int,float]]] = {}
-    for t, p in pts:
-        day = _date_key(t)
-        by_day.setdefault(day, []).append((t, p))
-
     # כתיבה ליומיים-שלושה אחרונים נשאיר בזיכרון, את השאר נאכסן
     all_days = sorted(by_day.keys())
     keep_tail = all_days[-KEEP_DAYS:] if len(all_days) > KEEP_DAYS else all_days
-    export_days = [d for d in all_days if d not in keep_tail]
+    export_days = all_days[:len(all_days) - len(keep_tail)]
 
-    for day in export_days:
-        _write_day_file(day, by_day[day])
-        print(f"[OK] wrote {len(by_day[day])} pts → price_history-{day}.jsonl.gz")
+    # gzip חוסם CPU – כל יום נדחס בתהליך נפרד (יום בודד נכתב ישירות)
+    labels = [_day_label(day) for day in export_days]
+    rows = [by_day[day] for day in export_days]
+    if len(export_days) > 1 and WORKERS != 1:
+        with ProcessPoolExecutor(max_workers=WORKERS) as pool:
+            list(pool.map(_write_day_file, labels, rows))
+    else:
+        for label, day_rows in zip(labels, rows):
+            _write_day_file(label, day_rows)
+    for label, day_rows in zip(labels, rows):
+        print(f"[OK] wrote {len(day_rows)} pts → price_history-{label}.jsonl.gz")
 
     # השארת הימים האחרונים בקובץ המקורי
     remain = []
@@ -74,10 +93,7 @@ def main():
         remain.extend(by_day[day])
     remain.sort(key=lambda x: x[0])  # לפי זמן
 
-    tmp = SRC.with_suffix(".json.tmp")
-    with open(tmp, "w", encoding="utf-8") as f:
-        json.dump([{"t": t, "p": p} for t, p in remain], f, ensure_ascii=False)
-    os.replace(tmp, SRC)
+    atomic_write_json(SRC, [{"t": t, "p": p} for t, p in remain])
     print(f"[OK] kept {len(remain)} recent pts in price_history.json (days={len(keep_tail)})")
 
 if __name__ == "__main__":
@@ -1,11 +1,36 @@
 #!/usr/bin/env python3
 import os, argparse, math, time
+from bisect import bisect_left
 from decimal import Decimal
 from dotenv import load_dotenv
 import ccxt
 
+from utils import WEIGHT_CANCEL, WEIGHT_OPEN_ORDERS, WEIGHT_PLACE, WeightBucket, make_precision_formatter, ttl_cache
+
 SYMBOL = "DOGE/USDT"
 SEED_TAG = "SEED"
+NEAR_PRICE_TOL = 0.0005  # ±0.05%
+WEIGHT_BUCKET = WeightBucket()  # תקציב ה-weight של Binance (1200/דקה)
+
+def too_close(p1, p2):
+    return abs(p1 - p2) / p2 <= NEAR_PRICE_TOL
+
+def near_existing(px, sorted_prices):
+    """האם px קרוב (±0.05%) למחיר כלשהו ברשימה ממוינת – בודק רק את השכנים הקרובים."""
+    i = bisect_left(sorted_prices, px)
+    if i > 0 and too_close(px, sorted_prices[i - 1]):
+        return True
+    return i < len(sorted_prices) and too_close(px, sorted_prices[i])
+
+@ttl_cache(2.0)
+def fetch_last_price(client, symbol):
+    """מחיר אחרון – נשמר 2 שניות כדי לא לשלוח REST כפול בהרצות צמודות."""
+    return float(client.fetch_ticker(symbol)["last"])
+
+@ttl_cache(5.0)
+def fetch_free_balance(client, asset):
+    """יתרה חופשית של asset – נשמרת 5 שניות."""
+    return float(client.fetch_balance()["free"].get(asset, 0.0))
 
 def main():
     p = argparse.ArgumentParser(description="Place a sell ladder from existing DOGE inventory")
@@ -33,19 +58,28 @@ def main():
     mkt = client.market(SYMBOL)
 
     # רט״ז
-    ticker = client.fetch_ticker(SYMBOL)
-    last = float(ticker["last"])
+    last = fetch_last_price(client, SYMBOL)
     print(f"[INFO] Last price {SYMBOL}: {last:.6f}")
 
     # יתרה חופשית
-    balance = client.fetch_balance()
-    free_doge = float(balance["free"].get("DOGE", 0.0))
+    free_doge = fetch_free_balance(client, "DOGE")
+    WEIGHT_BUCKET.acquire(WEIGHT_OPEN_ORDERS)
     open_orders = client.fetch_open_orders(SYMBOL)
+    WEIGHT_BUCKET.sync(client)
 
     seed_orders = [o for o in open_orders if (o.get("clientOrderId") or "").startswith(SEED_TAG)]
     if args.cancel_seed:
         print(f"[INFO] Cancelling {len(seed_orders)} existing SEED orders...")
+        # כשכל ההזמנות הפתוחות הן SEED – ביטול בבקשה אחת במקום בקשה לכל הזמנה
+        if seed_orders and len(seed_orders) == len(open_orders) and client.has.get("cancelAllOrders"):
+            try:
+                client.cancel_all_orders(SYMBOL)
+                print(f"[OK] Canceled {len(seed_orders)} SEED orders in one request")
+                return
+            except Exception as e:
+                print(f"[WARN] Bulk cancel failed, falling back to per-order: {e}")
         for o in seed_orders:
+            WEIGHT_BUCKET.acquire(WEIGHT_CANCEL)
             try:
                 client.cancel_order(o["id"], SYMBOL)
                 print(f"[OK] Canceled {o['id']} @ {o['price']}")
@@ -69,13 +103,10 @@ def main():
     targets = [ last * ((1.0 + step) ** (i+1)) for i in range(levels) ]
 
     # אל תכפיל הזמנות שכבר קיימות סביב אותם מחירים (±0.05%)
-    def too_close(p1, p2):
-        return abs(p1 - p2) / p2 <= 0.0005
-
-    existing_prices = [ float(o["price"]) for o in open_orders if o["side"].lower()=="sell" ]
+    existing_prices = sorted( float(o["price"]) for o in open_orders if o["side"].lower()=="sell" )
     plan = []
     for px in targets:
-        if any(too_close(px, ep) for ep in existing_prices):
+        if near_existing(px, existing_prices):
             print(f"[SKIP] Near existing sell @ {px:.6f}")
             continue
         plan.append(px)
@@ -84,11 +115,9 @@ def main():
         print("[INFO] Nothing to place (all targets near existing sells).")
         return
 
-    # עיגון דיוק לפי הבורסה
-    def p2p(x: float) -> str:  # price to precision (string)
-        return client.price_to_precision(SYMBOL, x)
-    def a2p(x: float) -> str:  # amount to precision (string)
-        return client.amount_to_precision(SYMBOL, x)
+    # עיגון דיוק לפי הבורסה – הדיוק קבוע לריצה, אז מכינים פורמטרים פעם אחת
+    p2p = make_precision_formatter(client, SYMBOL, "price")    # price to precision (string)
+    a2p = make_precision_formatter(client, SYMBOL, "amount")   # amount to precision (string)
 
     print(f"[PLAN] Will place {len(plan)} sells, lot={args.lot_doge} DOGE, step={args.step_pct}%")
     for i, px in enumerate(plan, 1):
@@ -97,6 +126,7 @@ def main():
         cid = f"{SEED_TAG}-{int(time.time())}-{i}"
         print(f"  SELL {amt_str} @ {price_str}  cid={cid}")
         if not args.dry_run:
+            WEIGHT_BUCKET.acquire(WEIGHT_PLACE)
             try:
                 client.create_order(SYMBOL, "limit", "sell", float(amt_str), float(price_str), {
                     "newClientOrderId": cid
@@ -5,10 +5,20 @@ This module handles loading and saving the application state to/from JSON files,
 including trading parameters, bank balances, and dynamic trading bounds.
 """
 
+import copy
 import json
+import logging
 import os
+import pathlib
+import threading
 from typing import Dict, Any
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+log = logging.getLogger(__name__)
 
 # Default state configuration
 DEFAULT_STATE = {
@@ -19,6 +29,70 @@ DEFAULT_STATE = {
 
 STATE_FILE = "state.json"
 
+# DOGE_JSON_PRETTY=1 writes indented JSON for humans; compact by default
+JSON_PRETTY = os.getenv("DOGE_JSON_PRETTY", "0") == "1"
+
+# DOGE_FSYNC=1 makes save_state durable across power loss (fsync file + directory)
+FSYNC = os.getenv("DOGE_FSYNC", "0") == "1"
+
+def _dumps(data: Dict[str, Any]) -> bytes:
+    """
+    Serialize state to UTF-8 JSON bytes (orjson when installed; indented if JSON_PRETTY).
+
+    Non-str keys are coerced as stdlib json does. Anything else orjson rejects
+    (e.g. NumPy scalars) goes through stdlib json, so the accepted input is
+    the same with or without orjson.
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if JSON_PRETTY else 0)
+        try:
+            return orjson.dumps(data, option=option)
+        except TypeError:
+            pass
+    return json.dumps(data, indent=2 if JSON_PRETTY else None, ensure_ascii=False).encode("utf-8")
+
+
+def _fsync_dir(directory: str) -> None:
+    """Flush a directory entry so a completed rename survives a crash."""
+    dir_fd = os.open(directory, os.O_RDONLY | getattr(os, "O_DIRECTORY", 0))
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
+
+
+def _loads(raw: bytes) -> Any:
+    """Parse JSON bytes (orjson when installed; both raise json.JSONDecodeError)."""
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+
+# Parsed state cached by (path, mtime_ns, inode, size); see load_state()
+_CACHE: Dict[str, Any] = {"key": None, "data": None}
+_CACHE_LOCK = threading.Lock()
+
+
+def _stat_key(st: os.stat_result) -> tuple:
+    """Cache key for the current STATE_FILE version."""
+    return (os.path.abspath(STATE_FILE), st.st_mtime_ns, st.st_ino, st.st_size)
+
+
+def _cache_put(key: tuple, data: Dict[str, Any]) -> None:
+    with _CACHE_LOCK:
+        _CACHE["key"] = key
+        _CACHE["data"] = copy.deepcopy(data)
+
+
+def _default_state() -> Dict[str, Any]:
+    """Fresh copy of DEFAULT_STATE; the nested bank dict is copied too."""
+    return {**DEFAULT_STATE, "bank": dict(DEFAULT_STATE["bank"])}
+
+
+def _with_defaults(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Apply DEFAULT_STATE to missing keys (and missing bank entries), one dict merge each."""
+    merged = {**DEFAULT_STATE, **data}
+    merged["bank"] = {**DEFAULT_STATE["bank"], **(data.get("bank") or {})}
+    return merged
+
 
 def load_state() -> Dict[str, Any]:
     """
@@ -30,19 +104,24 @@ def load_state() -> Dict[str, Any]:
 
     Note:
         If the state file doesn't exist or is corrupted, returns the default state.
+        The parsed file is cached and reused while its mtime/inode/size are
+        unchanged, so repeated calls cost one stat; callers get a deep copy.
     """
-    if os.path.exists(STATE_FILE):
-        try:
-            with open(STATE_FILE, "r", encoding="utf-8") as file:
-                data = json.load(file)
-                # Ensure all default keys are present
-                for key, value in DEFAULT_STATE.items():
-                    data.setdefault(key, value)
-                return data
-        except (json.JSONDecodeError, IOError) as e:
-            print(f"Warning: Could not load state file: {e}")
+    try:
+        key = _stat_key(os.stat(STATE_FILE))
+        with _CACHE_LOCK:
+            if _CACHE["key"] == key:
+                return copy.deepcopy(_CACHE["data"])
+        data = _loads(pathlib.Path(STATE_FILE).read_bytes())
+    except FileNotFoundError:
+        return _default_state()
+    except (json.JSONDecodeError, OSError) as e:
+        log.warning("Could not load state file: %s", e)
+        return _default_state()
 
-    return DEFAULT_STATE.copy()
+    merged = _with_defaults(data)
+    _cache_put(key, merged)
+    return merged
 
 
 def save_state(state_data: Dict[str, Any]) -> None:
@@ -57,15 +136,24 @@ def save_state(state_data: Dict[str, Any]) -> None:
         corruption if the process is interrupted during writing.
     """
     temp_file = STATE_FILE + ".tmp"
+    payload = _dumps(state_data)  # serialize first: a TypeError leaves no temp file behind
     try:
-        with open(temp_file, "w", encoding="utf-8") as file:
-            json.dump(state_data, file, indent=2, ensure_ascii=False)
+        with open(temp_file, "wb") as file:
+            file.write(payload)
+            file.flush()
+            if FSYNC:
+                os.fsync(file.fileno())
+            stat_result = os.fstat(file.fileno())
         os.replace(temp_file, STATE_FILE)
+        if FSYNC:
+            _fsync_dir(os.path.dirname(os.path.abspath(STATE_FILE)))
+        # Cache what load_state() would return for this file: parsed back from
+        # the payload (int keys come back as str) with defaults applied
+        _cache_put(_stat_key(stat_result), _with_defaults(_loads(payload)))
     except (IOError, OSError) as e:
-        print(f"Error: Could not save state file: {e}")
-        # Clean up temp file if it exists
-        if os.path.exists(temp_file):
-            try:
-                os.remove(temp_file)
-            except OSError:
-                pass
+        log.error("Could not save state file: %s", e)
+        # Clean up temp file if it was created (one syscall; missing file is fine)
+        try:
+            os.unlink(temp_file)
+        except OSError:  # includes FileNotFoundError
+            pass
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests for profit_split integer micro-USD accounting.
+"""
+
+import json
+import pathlib
+import tempfile
+from unittest.mock import patch, MagicMock
+
+import pytest
+
+import utils_stats
+import profit_split
+
+
+def test_legacy_float_state_is_migrated_to_micros():
+    """Schema v1 float USD fields are converted to integer micro-USD on load."""
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        test_split_file = pathlib.Path(tmpdir) / "split_state.json"
+        test_split_file.write_text(json.dumps({
+            "schema_version": 1,
+            "split_accumulator_usd": 0.16420510999999893,
+            "bnb_pending_usd": 1.25,
+            "reinvest_pool_usd": 3.5,
+            "total_sent_to_bnb_usd": 0.0,
+            "total_reinvested_usd": 0.0,
+            "last_update_ts": 1756129622.899481,
+            "last_action": "accumulate: +0.1642 (pending chunk)",
+            "min_cost_cache_usd": 0.0,
+            "min_cost_cache_ts": 0.0,
+        }))
+
+        with patch.object(profit_split, "STATE_FILE_PATH", test_split_file):
+            state = profit_split.read_state()
+            assert state["schema_version"] == profit_split.SCHEMA_VERSION
+            assert state["split_accumulator_usd"] == pytest.approx(0.164205)
+            assert state["bnb_pending_usd"] == 1.25
+            assert state["reinvest_pool_usd"] == 3.5
+
+
+def test_repeated_small_profits_do_not_drift():
+    """Many small profits add up to exact chunks with no float remainder."""
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        test_split_file = pathlib.Path(tmpdir) / "split_state.json"
+        test_stats_file = pathlib.Path(tmpdir) / "runtime_stats.json"
+
+        with patch.object(profit_split, "STATE_FILE_PATH", test_split_file), \
+             patch.object(utils_stats, "STATS_FILE", test_stats_file):
+
+            mock_exchange = MagicMock()
+            mock_exchange.market.return_value = {"limits": {"cost": {"min": 1000.0}}}
+
+            chunks = 0
+            for _ in range(400):
+                chunks += profit_split.handle_realized_profit(0.1, mock_exchange)["chunks"]
+
+            state = profit_split.read_state()
+            assert chunks == 10
+            assert state["split_accumulator_usd"] == 0.0
+            assert state["bnb_pending_usd"] == 20.0
+            assert state["reinvest_pool_usd"] == 20.0
+
+
+def test_cold_statistics_are_stored_separately():
+    """Totals move to split_stats.json; split_state.json keeps only hot fields."""
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        test_split_file = pathlib.Path(tmpdir) / "split_state.json"
+        test_split_file.write_text(json.dumps({
+            "schema_version": 2,
+            "split_accumulator_micros": 0,
+            "reinvest_pool_micros": 5_000_000,
+            "total_reinvested_micros": 1_000_000,
+        }))
+
+        with patch.object(profit_split, "STATE_FILE_PATH", test_split_file):
+            assert profit_split.pull_reinvestment_funds(2.0) == 2.0
+
+            hot = json.loads(test_split_file.read_text())
+            cold = json.loads((pathlib.Path(tmpdir) / "split_stats.json").read_text())
+            assert "total_reinvested_micros" not in hot
+            assert hot["reinvest_pool_micros"] == 3_000_000
+            assert cold["total_reinvested_micros"] == 3_000_000
+            assert profit_split.read_state()["total_reinvested_usd"] == 3.0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests for profit_watcher FIFO processing.
+"""
+
+import copy
+import random
+
+import pytest
+
+import profit_watcher
+
+
+def test_fifo_match_sell_matches_reference_formula():
+    """The formula inlined in fifo_match_sell gives exactly realized_profit_on_match summed per lot."""
+    from collections import deque
+
+    for seed in range(500):
+        rng = random.Random(seed)
+        lots = [{"qty": round(rng.uniform(0.01, 20), 2), "price": round(rng.uniform(0.1, 0.3), 5)}
+                for _ in range(rng.randint(0, 6))]
+        sell_price = round(rng.uniform(0.1, 0.3), 5)
+        qty = round(rng.uniform(0.01, 60), 2)
+
+        expected = 0.0
+        remaining = qty
+        for lot in lots:
+            if remaining <= 1e-12:
+                break
+            take = min(remaining, lot["qty"])
+            expected += profit_watcher.realized_profit_on_match(lot["price"], sell_price, take, 0.001)
+            remaining -= take
+
+        realized, matched = profit_watcher.fifo_match_sell(deque(copy.deepcopy(lots)), sell_price, qty, 0.001)
+        assert realized == expected
+        assert matched == qty - remaining
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
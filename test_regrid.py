@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests for regrid level and lot computation.
+"""
+
+import random
+
+import numpy as np
+
+import regrid
+
+
+def _geometric_levels_loop(pmin, pmax, step_pct):
+    """The original per-level loop."""
+    if pmin <= 0 or pmax <= 0 or pmax <= pmin:
+        return []
+    r = 1.0 + (step_pct / 100.0)
+    levels = [pmin]
+    while levels[-1] * r < pmax and len(levels) < 5000:
+        levels.append(levels[-1] * r)
+    if levels[-1] != pmax:
+        levels.append(pmax)
+    return sorted(set([round(x, 8) for x in levels]))
+
+
+def test_geometric_levels_matches_loop():
+    assert regrid.geometric_levels(0.435358, 0.6, 0.75) == _geometric_levels_loop(0.435358, 0.6, 0.75)
+    rng = random.Random(0)
+    for _ in range(5000):
+        pmin = round(rng.uniform(0.01, 2.0), rng.randint(2, 8))
+        pmax = pmin * rng.uniform(0.9, 3.0)
+        step = rng.choice([round(rng.uniform(0.05, 5.0), 2), rng.uniform(0.001, 10.0)])
+        assert regrid.geometric_levels(pmin, pmax, step) == _geometric_levels_loop(pmin, pmax, step)
+
+
+def test_lot_from_usd_np_matches_string_quantization():
+    rng = random.Random(0)
+    for _ in range(500):
+        q = rng.randint(0, 6)
+        usd = rng.choice([10.0, 12.5, 25.0])
+        # prices whose lot lands exactly on a rounding tie, plus ordinary ones
+        prices = np.array([usd / ((rng.randint(1, 10 ** 5) + 0.5) / 10 ** q) for _ in range(20)]
+                          + [rng.uniform(0.01, 2.0) for _ in range(20)] + [0.0])
+        expected = [float(f"{usd / p:.{q}f}") if p > 0 else 0.0 for p in prices.tolist()]
+        assert regrid.lot_from_usd_np(prices, usd, q, None).tolist() == expected
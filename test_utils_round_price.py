@@ -1,6 +1,25 @@
 import pytest
-from utils import round_price
+from utils import round_price, round_price_batch
 
 def test_round_price_rounds_down():
     assert round_price(1.2399, price_precision=2) == pytest.approx(1.23)
     assert round_price(1.235, price_precision=2) == pytest.approx(1.23)
+
+def test_round_price_batch_matches_scalar():
+    prices = [1.2399, 1.235, 0.123456, 0.2, 10.0]
+    for kwargs in ({"price_precision": 2}, {"price_precision": 5}, {"price_tick": 0.001}):
+        batch = list(round_price_batch(prices, **kwargs))
+        assert batch == [round_price(p, **kwargs) for p in prices]
+
+def test_precision_formatter_matches_ccxt():
+    ccxt = pytest.importorskip("ccxt")
+    from utils import make_precision_formatter
+
+    client = ccxt.binance()
+    client.markets = {"DOGE/USDT": {"id": "DOGEUSDT", "symbol": "DOGE/USDT", "precision": {"amount": 0.01, "price": 1e-05}}}
+    amount = make_precision_formatter(client, "DOGE/USDT", "amount")
+    price = make_precision_formatter(client, "DOGE/USDT", "price")
+    for value in (0.29, 0.57, 1.13, 4.35, 1.5, 3.0, 12345.678):
+        assert amount(value) == client.amount_to_precision("DOGE/USDT", value)
+    for value in (0.123455, 0.100005, 0.1, 2.0, 0.0795349):
+        assert price(value) == client.price_to_precision("DOGE/USDT", value)
@@ -2,14 +2,42 @@
 Utility functions for the DOGE trading bot.
 
 This module provides utility functions for price and quantity rounding,
-runtime statistics management, and other common operations needed by the bot.
+atomic JSON writes, exchange request throttling, and other common operations
+needed by the bot. Runtime statistics are handled by utils_stats.
 """
 
+import decimal
 import json
 import math
+import os
 import pathlib
 import threading
-from typing import Optional
+import time
+from functools import wraps
+from typing import Any, Callable, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# ccxt precisionMode values (ccxt.base.decimal_to_precision)
+_CCXT_DECIMAL_PLACES = 2
+_CCXT_TICK_SIZE = 4
+
+# 10**p for the precisions exchanges actually use; avoids int.__pow__ per call
+_POW10 = tuple(10 ** i for i in range(19))
+
+
+def _pow10(precision: Any) -> int:
+    """Return 10 ** precision, from _POW10 when in range."""
+    p = int(precision)
+    return _POW10[p] if 0 <= p < 19 else 10 ** p
 
 
 def round_down_qty(
@@ -31,12 +59,12 @@ def round_down_qty(
         Always rounds down to avoid exceeding available balance.
     """
     if amount_step:
-        step = float(amount_step)
+        step = amount_step if type(amount_step) is float else float(amount_step)
         if step > 0:
             return math.floor(qty / step) * step
 
     if amount_precision is not None:
-        factor = 10 ** int(amount_precision)
+        factor = _pow10(amount_precision)
         return math.floor(qty * factor) / factor
 
     return math.floor(qty)
@@ -61,86 +89,302 @@ def round_price(
         Always rounds down to avoid exceeding bid/ask constraints.
     """
     if price_tick:
-        step = float(price_tick)
+        step = price_tick if type(price_tick) is float else float(price_tick)
         if step > 0:
             return math.floor(price / step) * step
 
     if price_precision is not None:
         # Use floor to avoid rounding up which can exceed allowed price
-        factor = 10 ** int(price_precision)
+        factor = _pow10(price_precision)
         return math.floor(price * factor) / factor
 
     return price
 
 
-# Runtime statistics management
-_STATS_LOCK = threading.Lock()
-STATS_FILE = pathlib.Path.home() / "doge_bot" / "data" / "runtime_stats.json"
+def round_price_batch(
+    prices: Any, price_precision: Optional[int] = None, price_tick: Optional[float] = None
+) -> Any:
+    """
+    Round down many prices at once; the batch form of round_price().
+
+    Args:
+        prices: Sequence or array of prices
+        price_precision: Number of decimal places for precision-based rounding
+        price_tick: Tick size for tick-based rounding (takes precedence)
+
+    Returns:
+        np.ndarray: Rounded prices (a list when numpy is not installed)
+
+    Note:
+        One vectorized floor over the whole ladder instead of a Python call
+        per level; results match round_price() element by element.
+    """
+    if np is None:
+        return [round_price(float(p), price_precision, price_tick) for p in prices]
+
+    p = np.asarray(prices, dtype=np.float64)
+    if price_tick:
+        step = float(price_tick)
+        if step > 0:
+            return np.floor(p / step) * step
+
+    if price_precision is not None:
+        factor = _pow10(price_precision)
+        return np.floor(p * factor) / factor
+
+    return p
+
+
+def _precision_digits(precision: Any, precision_mode: Any) -> Optional[int]:
+    """
+    Convert a ccxt market precision value to a number of decimal places.
+
+    Args:
+        precision: Decimal places or tick size, depending on precision_mode
+        precision_mode: The exchange's ccxt precisionMode
+
+    Returns:
+        Optional[int]: Decimal places, or None if the precision is not a
+        power-of-ten tick or decimal place count
+    """
+    if precision_mode == _CCXT_DECIMAL_PLACES:
+        return precision if isinstance(precision, int) and precision >= 0 else None
+    if precision_mode != _CCXT_TICK_SIZE or not isinstance(precision, (int, float)) or not 0 < precision <= 1:
+        return None
+    digits = round(-math.log10(precision))
+    return digits if math.isclose(10 ** -digits, precision) else None
 
 
-def _read_stats() -> dict:
+def make_precision_formatter(exchange_client: Any, symbol: str, field: str) -> Callable[[float], str]:
     """
-    Read runtime statistics from the stats file.
+    Build a formatter equivalent to ccxt price_to_precision/amount_to_precision.
+
+    Args:
+        exchange_client: ccxt exchange instance with markets loaded
+        symbol: Market symbol (e.g., "DOGE/USDT")
+        field: "price" (rounded half up) or "amount" (truncated)
 
     Returns:
-        dict: Statistics dictionary with default values if file doesn't exist
+        Callable[[float], str]: Formatter for values of that field
+
+    Note:
+        The market precision is resolved once, so each call is a single
+        Decimal quantize instead of ccxt's lookup and precision parsing. Like
+        ccxt, the value is taken from its str() form, so 0.29 stays 0.29 and
+        0.123455 rounds to 0.12346. Precisions that are not a power-of-ten
+        tick, and values that round to zero, go through the ccxt helper.
     """
-    try:
-        with STATS_FILE.open("r", encoding="utf-8") as file:
-            data = json.load(file)
-            if isinstance(data, dict):
-                return data
-    except (json.JSONDecodeError, IOError, OSError):
-        pass
+    helper = exchange_client.price_to_precision if field == "price" else exchange_client.amount_to_precision
+    digits = _precision_digits(
+        (exchange_client.market(symbol).get("precision") or {}).get(field),
+        getattr(exchange_client, "precisionMode", None),
+    )
+    if digits is None:
+        return lambda value: helper(symbol, value)
+
+    quantum = decimal.Decimal(1).scaleb(-digits)
+    rounding = decimal.ROUND_HALF_UP if field == "price" else decimal.ROUND_DOWN
+
+    def formatter(value: float) -> str:
+        text = format(decimal.Decimal(str(value)).quantize(quantum, rounding=rounding), "f")
+        text = text.rstrip("0").rstrip(".") if "." in text else text
+        # ccxt rejects values that round to zero; let it raise its own error
+        return helper(symbol, value) if text in ("0", "-0") else text
 
-    return {
-        "cumulative_profit_usd": 0.0,
-        "splits_count": 0,
-        "bnb_converted_usd": 0.0,
-        "trade_count": 0,
-        "trigger_amount_usd": 0.0,
-    }
+    return formatter
 
 
-def _write_stats(stats_data: dict) -> None:
+def atomic_write_bytes(file_path: pathlib.Path, payload: bytes) -> None:
     """
-    Write runtime statistics to the stats file atomically.
+    Write bytes to a file atomically and durably.
 
     Args:
-        stats_data: Dictionary containing statistics to write
+        file_path: Destination path
+        payload: Already serialized file contents
+
+    Note:
+        Writes to a sibling temp file, fsyncs it, then renames it over the
+        destination, so readers see either the old or the new file, never a
+        partial write.
     """
-    STATS_FILE.parent.mkdir(parents=True, exist_ok=True)
-    temp_file = STATS_FILE.with_suffix(".json.tmp")
+    file_path = pathlib.Path(file_path)
+    temp_file = file_path.with_suffix(file_path.suffix + ".tmp")
 
-    with temp_file.open("w", encoding="utf-8") as file:
-        json.dump(stats_data, file, ensure_ascii=False, indent=2)
+    with temp_file.open("wb") as file:
+        file.write(payload)
+        file.flush()
+        os.fsync(file.fileno())
 
-    temp_file.replace(STATS_FILE)
+    os.replace(temp_file, file_path)
 
 
-def add_realized_profit(
-    profit_usd: float, *, inc_splits: int = 0, add_bnb_usd: float = 0.0
-) -> None:
+def dump_json_bytes(data: Any) -> bytes:
     """
-    Add realized profit to the runtime statistics.
+    Serialize data to compact UTF-8 JSON bytes.
 
     Args:
-        profit_usd: Profit amount in USD to add
-        inc_splits: Number of profit splits to increment (keyword-only)
-        add_bnb_usd: Amount of BNB converted in USD to add (keyword-only)
+        data: JSON-serializable object
+
+    Returns:
+        bytes: Encoded JSON document
+
+    Note:
+        Uses orjson when installed, stdlib json otherwise.
+    """
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False).encode("utf-8")
+
+
+def load_json_bytes(raw: bytes) -> Any:
+    """
+    Parse a JSON document from bytes.
+
+    Args:
+        raw: Encoded JSON document
+
+    Returns:
+        Any: Decoded object
 
     Note:
-        This function is thread-safe and uses atomic file operations.
+        Uses orjson when installed, stdlib json otherwise. Both raise a
+        json.JSONDecodeError subclass on malformed input.
+    """
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def atomic_write_json(file_path: pathlib.Path, data: Any) -> None:
     """
-    with _STATS_LOCK:
-        stats = _read_stats()
+    Write data as JSON to a file atomically and durably.
+
+    Args:
+        file_path: Destination path
+        data: JSON-serializable object to write
+    """
+    atomic_write_bytes(file_path, dump_json_bytes(data))
+
+
+# Binance request weights (per 1-minute window) for the calls the scripts make
+WEIGHT_CANCEL = 1
+WEIGHT_PLACE = 1
+WEIGHT_OPEN_ORDERS = 3
+WEIGHT_MY_TRADES = 10
+
+
+class WeightBucket:
+    """
+    Token bucket sized to Binance's request-weight budget.
+
+    Each call debits its documented weight; acquire() sleeps only when the
+    bucket would go negative, instead of a fixed sleep between every call.
+
+    Args:
+        capacity: Maximum weight per window (Binance: 1200 per minute)
+        refill_per_sec: Weight restored per second (capacity / 60)
+    """
+
+    def __init__(self, capacity: float = 1200.0, refill_per_sec: float = 20.0):
+        self.capacity = float(capacity)
+        self.refill_per_sec = float(refill_per_sec)
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.refill_per_sec)
+        self._last = now
+
+    def acquire(self, weight: float = 1.0) -> float:
+        """
+        Reserve weight from the bucket, sleeping until it is available.
+
+        Args:
+            weight: Request weight of the upcoming call
+
+        Returns:
+            float: Seconds slept (0.0 when the budget was available)
+
+        Note:
+            The weight is reserved under the lock and the sleep happens outside
+            it, so concurrent callers queue up behind each other fairly.
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= weight
+            wait = -self._tokens / self.refill_per_sec if self._tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def calibrate(self, used_weight: float) -> None:
+        """
+        Align the bucket with the weight the server reports as already used.
+
+        Args:
+            used_weight: Value of the X-MBX-USED-WEIGHT(-1M) response header
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self._tokens, self.capacity - float(used_weight))
+
+    def sync(self, exchange_client: Any) -> None:
+        """
+        Calibrate from the last ccxt response headers, if they carry the used weight.
+
+        Args:
+            exchange_client: ccxt exchange instance (uses last_response_headers)
+        """
+        headers = getattr(exchange_client, "last_response_headers", None) or {}
+        for name, value in headers.items():
+            if name.lower() in ("x-mbx-used-weight-1m", "x-mbx-used-weight"):
+                try:
+                    self.calibrate(float(value))
+                except (TypeError, ValueError):
+                    pass
+                return
+
+
+def ttl_cache(seconds: float) -> Callable:
+    """
+    Cache an exchange accessor's result for a short time.
+
+    Args:
+        seconds: How long a cached value stays valid
+
+    Returns:
+        Callable: Decorator for functions taking the exchange client first
+
+    Note:
+        Entries are keyed by (id(exchange_client), *args), like the
+        profit_split minimum-cost cache, so different clients never share a
+        value. Exceptions are not cached. The wrapper exposes cache_clear().
+    """
+
+    def decorator(func: Callable) -> Callable:
+        cache: dict[tuple, tuple[Any, float]] = {}
+        lock = threading.Lock()
+
+        @wraps(func)
+        def wrapper(exchange_client: Any, *args: Any) -> Any:
+            key = (id(exchange_client), *args)
+            now = time.monotonic()
+            with lock:
+                hit = cache.get(key)
+            if hit is not None and hit[1] > now:
+                return hit[0]
+            value = func(exchange_client, *args)
+            with lock:
+                cache[key] = (value, now + seconds)
+            return value
+
+        wrapper.cache_clear = cache.clear
+        return wrapper
 
-        current_profit = float(stats.get("cumulative_profit_usd", 0.0) or 0.0)
-        current_splits = int(stats.get("splits_count", 0) or 0)
-        current_bnb = float(stats.get("bnb_converted_usd", 0.0) or 0.0)
+    return decorator
 
-        stats["cumulative_profit_usd"] = current_profit + float(profit_usd)
-        stats["splits_count"] = current_splits + int(inc_splits)
-        stats["bnb_converted_usd"] = current_bnb + float(add_bnb_usd)
 
-        _write_stats(stats)
+# Runtime statistics live in utils_stats (single source of truth for
+# runtime_stats.json); these names are kept importable from utils.
+from utils_stats import STATS_FILE, add_realized_profit, read_stats as _read_stats  # noqa: E402,F401
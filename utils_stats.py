@@ -12,49 +12,186 @@ utils_stats.py
 - last_update_ts
 - schema_version
 
-כולל כתיבה אטומית ונעילה בין-תהליכית (fcntl).
+כולל כתיבה אטומית; קובץ ה-tmp עצמו (O_CREAT|O_EXCL + flock) משמש כמנעול בין-תהליכי לכותבים.
+
+עדכונים מצטברים (add_*) נשמרים בזיכרון כ-דלתאות ונכתבים לדיסק ב-flush מושהה
+(STATS_FLUSH_SEC, ברירת מחדל 0.5s; 0 = כתיבה מיידית) ובסיום התהליך.
+read_stats מחזיר את הקובץ + הדלתאות שטרם נכתבו, כך שהקוראים בתהליך תמיד מעודכנים.
 """
 
 from __future__ import annotations
-import os, json, time, pathlib, contextlib
+import os, json, time, pathlib, contextlib, threading, atexit, logging
+
+try:
+    import orjson  # סריאליזציה מהירה (C) ישירות ל-bytes
+except ImportError:
+    orjson = None
+
+try:
+    import fcntl  # flock על קובץ ה-tmp – משתחרר ע"י הקרנל אם הכותב קרס
+except ImportError:  # ווינדוס – רק בדיקת גיל
+    fcntl = None
+
+try:
+    import msgpack  # פורמט בינארי אופציונלי (DOGE_STATS_FORMAT=msgpack)
+except ImportError:
+    msgpack = None
+
+log = logging.getLogger(__name__)
 
 # נתיב בסיסי
-DATA_DIR = pathlib.Path.home() / "doge_bot" / "data"
-DATA_DIR.mkdir(parents=True, exist_ok=True)
+DATA_DIR = pathlib.Path.home() / "doge_bot" / "data"  # נוצרת בכתיבה הראשונה, לא ב-import
 STATS_FILE = DATA_DIR / "runtime_stats.json"
 
 SCHEMA_VERSION = 1
 DEFAULT_TRIGGER = float(os.getenv("SPLIT_CHUNK_USD", "4.0"))
+FLUSH_SEC = float(os.getenv("STATS_FLUSH_SEC", "0.5"))
+# DOGE_JSON_PRETTY=1 – JSON מוזח לקריאה בעין; ברירת המחדל קומפקטית (קובץ קטן יותר, כתיבה מהירה יותר)
+JSON_PRETTY = os.getenv("DOGE_JSON_PRETTY", "0") == "1"
+# DOGE_STATS_FORMAT=msgpack – כתיבה בינארית קטנה ומהירה יותר; הקריאה מזהה את הפורמט לפי הבית הראשון,
+# כך שמעבר (וחזרה ל-json) לא דורש המרה. ייצוא JSON (כולל קבצי ה-split): python utils_stats.py --export-json [DIR]
+STATS_FORMAT = os.getenv("DOGE_STATS_FORMAT", "json").strip().lower()
+TMP_STALE_SEC = 10.0  # tmp שאף אחד לא נועל וישן מזה נחשב שארית מקריסה ונמחק
+# DOGE_FSYNC=1 (פרודקשן): fsync לקובץ לפני ה-rename ולתיקייה אחריו – שורד גם נפילת חשמל
+FSYNC = os.getenv("DOGE_FSYNC", "0") == "1"
 
-# --------------------------
-# נעילה (fcntl) בין-תהליכית
-# --------------------------
-@contextlib.contextmanager
-def file_lock(path: pathlib.Path):
+# דלתאות שטרם נכתבו: {שדה: תוספת}, שייכות לקובץ _PENDING_PATH
+# _STATS_LOCK מוחזק רק לעדכוני dict (מיקרו-שניות); הכתיבה לדיסק מתבצעת תחת _WRITE_LOCK בלבד,
+# כך ש-add_*/read_stats לא ממתינים ל-I/O של flush
+_STATS_LOCK = threading.Lock()
+_WRITE_LOCK = threading.Lock()
+_PENDING: dict = {}
+_PENDING_PATH: pathlib.Path | None = None
+# דלתאות שנמצאות כרגע בכתיבה; key = ה-stat של הקובץ החדש שכבר כולל אותן (נקבע לפני ה-rename),
+# gen עולה בכל סיום כתיבה – read_stats קורא שוב אם כתיבה הסתיימה באמצע הקריאה שלו
+_INFLIGHT: dict = {"path": None, "deltas": {}, "key": None, "gen": 0}
+_flush_timer: threading.Timer | None = None
+_exit_hooks_installed = False
+_DIRS_READY: set = set()  # תיקיות שכבר וידאנו שקיימות (mkdir פעם אחת לתהליך)
+
+# מטמון של הקובץ המפוענח, לפי (נתיב, mtime_ns, inode, גודל) – קריאה בלי שינוי עולה stat בלבד
+_CACHE: dict = {"key": None, "data": None}
+_CACHE_LOCK = threading.Lock()
+
+def _stat_key(path: pathlib.Path, st: os.stat_result) -> tuple:
+    return (str(path), st.st_mtime_ns, st.st_ino, st.st_size)
+
+def _cache_put(key: tuple, data: dict) -> None:
+    with _CACHE_LOCK:
+        _CACHE["key"] = key
+        _CACHE["data"] = data
+
+def _dumps_json(obj: dict) -> bytes:
+    if orjson is not None:
+        # מפתחות שאינם str מומרים כמו ב-json; מה ש-orjson דוחה (למשל numpy scalars) עובר ל-json
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if JSON_PRETTY else 0))
+        except TypeError:
+            pass
+    return json.dumps(obj, ensure_ascii=False, indent=2 if JSON_PRETTY else None).encode("utf-8")
+
+def _dumps(obj: dict) -> bytes:
+    if STATS_FORMAT == "msgpack" and msgpack is not None:
+        return msgpack.packb(obj, use_bin_type=True)
+    return _dumps_json(obj)
+
+def decode_payload(raw: bytes):
+    """מפענח קובץ סטטוס/מצב: JSON (בית ראשון ASCII) או msgpack (map – בית ראשון >= 0x80)."""
+    if not raw or raw[0] < 0x80 or msgpack is None:
+        return orjson.loads(raw) if orjson is not None else json.loads(raw)
+    return msgpack.unpackb(raw, raw=False)
+
+_loads = decode_payload
+
+def _remove_stale_tmp(tmp: pathlib.Path) -> bool:
     """
-    נעילת קובץ פשוטה (POSIX). מייצרת קובץ .lock צמוד. על macOS/לינוקס זה יעבוד.
-    אם fcntl לא קיים (ווינדוס) – נילון no-op (עדיין כתיבה אטומית עם os.replace).
+    מוחק tmp שנשאר מקריסה. ישן = אף כותב לא מחזיק עליו flock וגילו מעל TMP_STALE_SEC.
+    מוחקים רק כשמחזיקים את ה-flock ורק אם tmp עדיין אותו inode – כך שני ממתינים לא מוחקים
+    tmp טרי של מישהו אחר, וכותב איטי (למשל fsync על דיסק איטי) לא מאבד את ה-tmp שלו.
+    מחזיר True אם tmp כבר לא שם (אפשר לנסות O_EXCL מיד).
     """
-    lock_path = path.with_suffix(path.suffix + ".lock")
-    lock_path.parent.mkdir(parents=True, exist_ok=True)
-    fh = open(lock_path, "a+")
     try:
+        fd = os.open(tmp, os.O_RDONLY)
+    except FileNotFoundError:
+        return True
+    try:
+        if fcntl is not None:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                return False  # כותב חי מחזיק אותו
+        st = os.fstat(fd)
+        if time.time() - st.st_mtime <= TMP_STALE_SEC:
+            return False
+        try:
+            if os.stat(tmp).st_ino != st.st_ino:
+                return True  # הוחלף כבר ב-tmp חדש
+        except FileNotFoundError:
+            return True
+        tmp.unlink()
+        return True
+    finally:
+        os.close(fd)
+
+def _open_exclusive_tmp(tmp: pathlib.Path) -> int:
+    """
+    יוצר את קובץ ה-tmp עם O_EXCL ונועל אותו ב-flock – מי שיצר אותו מחזיק את "המנעול"
+    עד ה-rename. כותבים מתחרים ממתינים ומנסים שוב; tmp שנשאר מקריסה נמחק (_remove_stale_tmp).
+    """
+    while True:
         try:
-            import fcntl  # type: ignore
-            fcntl.flock(fh.fileno(), fcntl.LOCK_EX)
-            yield
-            fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
-        except Exception:
-            # no-op lock
-            yield
+            fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+        except FileExistsError:
+            if not _remove_stale_tmp(tmp):
+                time.sleep(0.005)
+            continue
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        return fd
+
+def _fsync_dir(directory: pathlib.Path) -> None:
+    """fsync לתיקייה כדי שה-rename עצמו יישמר בדיסק."""
+    dir_fd = os.open(directory, os.O_RDONLY | getattr(os, "O_DIRECTORY", 0))
+    try:
+        os.fsync(dir_fd)
     finally:
-        fh.close()
+        os.close(dir_fd)
 
-def _atomic_write_json(path: pathlib.Path, obj: dict) -> None:
+def _exclusive_rewrite(path: pathlib.Path, update, on_written=None) -> dict:
+    """
+    read → update → write אטומי מול תהליכים אחרים: ה-tmp נפתח ב-O_EXCL לפני הקריאה
+    ומוחלף לתוך path בסוף. update מקבל את המצב שבדיסק ומחזיר את המצב החדש.
+    on_written(key) נקרא עם מפתח המטמון של הקובץ החדש, רגע לפני ה-rename.
+    """
+    if path.parent not in _DIRS_READY:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _DIRS_READY.add(path.parent)
     tmp = path.with_suffix(path.suffix + ".tmp")
-    with open(tmp, "w", encoding="utf-8") as f:
-        json.dump(obj, f, ensure_ascii=False, indent=2)
-    os.replace(tmp, path)
+    fd = _open_exclusive_tmp(tmp)
+    try:
+        d = update(_read_file_stats(path)[1])
+        view = memoryview(_dumps(d))
+        while view:
+            view = view[os.write(fd, view):]
+        if FSYNC:
+            os.fsync(fd)
+        st = os.fstat(fd)
+        if on_written is not None:
+            on_written(_stat_key(path, st))
+        os.replace(tmp, path)  # ה-flock מוחזק עד אחרי ה-rename
+        os.close(fd)
+        fd = -1
+        if FSYNC:
+            _fsync_dir(path.parent)
+    except BaseException:
+        if fd >= 0:
+            with contextlib.suppress(FileNotFoundError):
+                tmp.unlink()  # עדיין מחזיקים את ה-flock, כך שזה ה-tmp שלנו
+            os.close(fd)
+        raise
+    # ה-stat נלקח מה-tmp לפני ה-rename, כך שכתיבה מתחרה לא תירשם במטמון בטעות
+    _cache_put(_stat_key(path, st), dict(d))
+    return d
 
 def _defaults() -> dict:
     now = time.time()
@@ -69,29 +206,181 @@ def _defaults() -> dict:
         "last_update_ts": now,
     }
 
+_FLOAT_FIELDS = ("cumulative_profit_usd", "bnb_converted_usd", "trigger_amount_usd", "last_update_ts")
+_INT_FIELDS = ("sell_trades_count", "actual_splits_count", "trade_count")
+
 def _hydrate(d: dict) -> dict:
+    """ממזג עם ברירות המחדל ומנרמל טיפוסים פעם אחת בקריאה – העדכונים מניחים float/int."""
     base = _defaults()
     if isinstance(d, dict):
         base.update({k: v for k, v in d.items() if k in base})
         # שמירה על schema_version עדכני
         base["schema_version"] = SCHEMA_VERSION
+        for k in _FLOAT_FIELDS:
+            base[k] = float(base[k] or 0.0)
+        for k in _INT_FIELDS:
+            base[k] = int(base[k] or 0)
     return base
 
+def _read_file_stats(path: pathlib.Path) -> tuple:
+    """
+    (key, stats) – הקובץ כפי שהוא בדיסק (בלי דלתאות בזיכרון); key=None אם אין קובץ תקין.
+    ללא נעילה – os.replace מבטיח קובץ שלם.
+    """
+    try:
+        key = _stat_key(path, path.stat())
+        with _CACHE_LOCK:
+            if _CACHE["key"] == key:
+                return key, dict(_CACHE["data"])
+        data = _hydrate(_loads(path.read_bytes()))
+    except Exception:  # כולל FileNotFoundError – אין קובץ עדיין
+        return None, _defaults()
+    # נכתב לפי ה-stat שלפני הקריאה: אם הקובץ התחלף בינתיים, הקריאה הבאה תפספס ותקרא שוב
+    _cache_put(key, data)
+    return key, dict(data)
+
+def _apply_deltas(st: dict, deltas: dict) -> dict:
+    for k, v in deltas.items():
+        st[k] = st.get(k, 0) + v
+    return st
+
 def read_stats() -> dict:
+    while True:
+        gen = _INFLIGHT["gen"]
+        key, st = _read_file_stats(STATS_FILE)
+        with _STATS_LOCK:
+            if _INFLIGHT["gen"] != gen:
+                continue  # ייתכן שקראנו קובץ ישן והדלתאות שלו כבר לא ב-_INFLIGHT
+            # דלתאות בכתיבה נספרות רק אם קראנו את הקובץ הישן (עוד לא הגרסה שכוללת אותן)
+            if _INFLIGHT["deltas"] and _INFLIGHT["path"] == STATS_FILE and key != _INFLIGHT["key"]:
+                _apply_deltas(st, _INFLIGHT["deltas"])
+            if _PENDING and _PENDING_PATH == STATS_FILE:
+                _apply_deltas(st, _PENDING)
+        return st
+
+def _mark_inflight(key: tuple) -> None:
+    with _STATS_LOCK:
+        _INFLIGHT["key"] = key
+
+def _clear_inflight() -> None:
+    """הקורא מחזיק את _STATS_LOCK."""
+    _INFLIGHT.update(path=None, deltas={}, key=None, gen=_INFLIGHT["gen"] + 1)
+
+def _rewrite_with_inflight(path: pathlib.Path, deltas: dict, update) -> None:
+    """
+    כתיבה בלעדית מחוץ ל-_STATS_LOCK (הקורא מחזיק את _WRITE_LOCK). deltas כבר הוצאו מ-_PENDING;
+    עד ה-rename read_stats ממשיך להוסיף אותם לקובץ הישן. בכישלון הם חוזרים ל-_PENDING.
+    """
+    with _STATS_LOCK:
+        _INFLIGHT.update(path=path, deltas=deltas, key=None)
     try:
-        if STATS_FILE.exists():
-            with file_lock(STATS_FILE):
-                with open(STATS_FILE, "r", encoding="utf-8") as f:
-                    return _hydrate(json.load(f))
-    except Exception:
-        pass
-    return _defaults()
+        _exclusive_rewrite(path, update, _mark_inflight)
+    except BaseException:
+        with _STATS_LOCK:
+            if _PENDING_PATH == path:
+                _apply_deltas(_PENDING, deltas)
+            _clear_inflight()
+        raise
+    with _STATS_LOCK:
+        _clear_inflight()
 
 def write_stats(d: dict) -> None:
+    """
+    כתיבה מוחלטת של כל הסטטיסטיקות. d אמור להיות נגזר מ-read_stats (שכבר כולל את
+    הדלתאות בזיכרון), ולכן הדלתאות הממתינות לאותו קובץ נמחקות ולא יתווספו שוב.
+    """
     d = _hydrate(d)
     d["last_update_ts"] = time.time()
-    with file_lock(STATS_FILE):
-        _atomic_write_json(STATS_FILE, d)
+    with _WRITE_LOCK:
+        with _STATS_LOCK:
+            deltas = {}
+            if _PENDING_PATH == STATS_FILE:
+                deltas = dict(_PENDING)
+                _PENDING.clear()
+        _rewrite_with_inflight(STATS_FILE, deltas, lambda _: d)
+
+def set_bnb_converted_usd(total_usd: float) -> dict:
+    """
+    קובע את bnb_converted_usd לערך מוחלט (לא הוספה); דלתאות BNB ממתינות לאותו קובץ נמחקות.
+    שאר השדות נקראים מהדיסק בתוך אותה כתיבה בלעדית, כך שלא נדרסים.
+    """
+    def update(st: dict) -> dict:
+        st["bnb_converted_usd"] = float(total_usd)
+        st["last_update_ts"] = time.time()
+        return st
+    with _WRITE_LOCK:
+        with _STATS_LOCK:
+            if _PENDING_PATH == STATS_FILE:
+                _PENDING.pop("bnb_converted_usd", None)
+        _exclusive_rewrite(STATS_FILE, update)
+    return read_stats()
+
+# --------------------------
+# flush מושהה לדלתאות
+# --------------------------
+def _write_deltas(path: pathlib.Path, deltas: dict) -> None:
+    def update(st: dict) -> dict:
+        _apply_deltas(st, deltas)
+        st["last_update_ts"] = time.time()
+        return st
+    _rewrite_with_inflight(path, deltas, update)
+
+def flush_stats() -> None:
+    """כותב מיד את כל העדכונים שהצטברו בזיכרון (נקרא גם מה-timer וב-atexit)."""
+    global _flush_timer
+    with _WRITE_LOCK:
+        with _STATS_LOCK:
+            _flush_timer = None
+            if not _PENDING or _PENDING_PATH is None:
+                return
+            path, deltas = _PENDING_PATH, dict(_PENDING)
+            _PENDING.clear()
+        # I/O מחוץ ל-_STATS_LOCK: add_*/read_stats ממשיכים לעבוד בזמן הכתיבה
+        _write_deltas(path, deltas)
+
+def _timer_flush() -> None:
+    try:
+        flush_stats()
+    except Exception as e:
+        # הדלתאות נשארות בזיכרון וייכתבו בעדכון/flush הבא
+        log.warning("[STATS] flush failed: %s", e)
+
+def _install_exit_hooks() -> None:
+    global _exit_hooks_installed
+    _exit_hooks_installed = True
+    # רק atexit – ספרייה לא מתקינה signal handlers; תסריט שרוצה flush גם ב-SIGTERM קורא ל-flush_stats בעצמו
+    atexit.register(_timer_flush)
+
+def _add_deltas(**deltas) -> dict:
+    """מוסיף דלתאות בזיכרון ומתזמן flush; מחזיר את המצב המעודכן (קובץ + דלתאות)."""
+    global _PENDING_PATH, _flush_timer
+    stale = None
+    with _STATS_LOCK:
+        if _PENDING_PATH != STATS_FILE:
+            # הנתיב הוחלף (למשל בטסטים) – הדלתאות הישנות נכתבות לקובץ שלהן (מחוץ לנעילה)
+            if _PENDING:
+                stale = (_PENDING_PATH, dict(_PENDING))
+                _PENDING.clear()
+            _PENDING_PATH = STATS_FILE
+        for k, v in deltas.items():
+            if v:  # מדלג גם על None; הטיפוסים בקובץ כבר מנורמלים ב-_hydrate
+                _PENDING[k] = _PENDING.get(k, 0) + v
+        flush_now = FLUSH_SEC <= 0
+        if not flush_now and _PENDING and _flush_timer is None:
+            if not _exit_hooks_installed:
+                _install_exit_hooks()
+            _flush_timer = threading.Timer(FLUSH_SEC, _timer_flush)
+            _flush_timer.daemon = True
+            _flush_timer.start()
+    if stale is not None:
+        try:
+            with _WRITE_LOCK:
+                _write_deltas(*stale)
+        except OSError as e:
+            log.warning("[STATS] dropping updates for %s: %s", stale[0], e)
+    if flush_now:
+        flush_stats()
+    return read_stats()
 
 # --------------------------
 # עדכונים פומביים
@@ -107,15 +396,9 @@ def add_realized_profit(delta_usd: float, inc_sell_trades: int = 0, inc_trades:
         inc_sell_trades: Number of sell trades that matched inventory to add
         inc_trades: Number of general trades to add
     """
-    st = read_stats()
-    if delta_usd:
-        st["cumulative_profit_usd"] = float(st.get("cumulative_profit_usd", 0.0) + float(delta_usd))
-    if inc_sell_trades:
-        st["sell_trades_count"] = int(st.get("sell_trades_count", 0)) + int(inc_sell_trades)
-    if inc_trades:
-        st["trade_count"] = int(st.get("trade_count", 0)) + int(inc_trades)
-    write_stats(st)
-    return st
+    return _add_deltas(cumulative_profit_usd=delta_usd,
+                       sell_trades_count=inc_sell_trades,
+                       trade_count=inc_trades)
 
 def add_actual_splits(inc_actual_splits: int) -> dict:
     """
@@ -125,20 +408,37 @@ def add_actual_splits(inc_actual_splits: int) -> dict:
     Args:
         inc_actual_splits: Number of actual profit chunks processed to add
     """
-    st = read_stats()
-    if inc_actual_splits:
-        st["actual_splits_count"] = int(st.get("actual_splits_count", 0)) + int(inc_actual_splits)
-    write_stats(st)
-    return st
+    return _add_deltas(actual_splits_count=inc_actual_splits)
 
 def add_bnb_converted_usd(delta_usd: float) -> dict:
-    st = read_stats()
-    st["bnb_converted_usd"] = float(st.get("bnb_converted_usd", 0.0) + float(delta_usd))
-    write_stats(st)
-    return st
+    return _add_deltas(bnb_converted_usd=delta_usd)
 
 def set_trigger_amount_usd(v: float) -> dict:
     st = read_stats()
     st["trigger_amount_usd"] = float(v)
     write_stats(st)
     return st
+
+if __name__ == "__main__":
+    # ייצוא JSON קריא (גם כשהקבצים נשמרים כ-msgpack) – לבדיקה ידנית / validate_data
+    import argparse
+    ap = argparse.ArgumentParser(description="runtime stats tools")
+    ap.add_argument("--export-json", metavar="DIR", nargs="?", const="-",
+                    help="print runtime/split files as one JSON object (or write each as JSON into DIR)")
+    args = ap.parse_args()
+    if args.export_json:
+        exported = {STATS_FILE.name: read_stats()}
+        for name in ("split_state.json", "split_stats.json"):  # קבצי profit_split (אותו פורמט)
+            try:
+                exported[name] = _loads((DATA_DIR / name).read_bytes())
+            except FileNotFoundError:
+                pass
+        if args.export_json == "-":
+            print(json.dumps(exported, ensure_ascii=False, indent=2))
+        else:
+            out_dir = pathlib.Path(args.export_json).expanduser()
+            out_dir.mkdir(parents=True, exist_ok=True)
+            for name, data in exported.items():
+                (out_dir / name).write_text(json.dumps(data, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    else:
+        ap.print_help()
@@ -11,19 +11,61 @@ Validated files:
 - runtime_stats.json: Cumulative trading statistics
 - profit_watcher_state.json: Profit tracking and inventory data
 - split_state.json: Profit splitting configuration and state
+- split_stats.json: Profit splitting cumulative statistics (optional)
 - runtime_state.json: Runtime operational state (optional)
 - price_history.json: Historical price data (optional)
+
+Results are cached in .validate_cache.json by file mtime/size; set
+VALIDATE_CACHE=0 to always re-read every file.
 """
 
 from __future__ import annotations
 
+import contextlib
+import functools
+import importlib
+import io
 import json
-import pathlib
-from typing import Any, Dict, Optional
+import mmap
+import os
+import re
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+
+try:
+    import orjson  # C parser for the small fixed-schema files
+except ImportError:
+    orjson = None
+
+
+@functools.lru_cache(maxsize=None)
+def _optional_module(name: str) -> Any:
+    """
+    Import an optional dependency on first use; None when it is not installed.
+
+    numpy (vectorized qty scan), ijson (streaming parser; picks the yajl2_c
+    backend when it is built) and fastjsonschema (compiled stats schema) are
+    only needed on some paths, so a run that replays cached results or has
+    small files never pays their import time.
+    """
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
 
 
 # Data directory configuration
-DATA_DIR = pathlib.Path.home() / "doge_bot" / "data"
+DATA_DIR = os.path.join(os.path.expanduser("~"), "doge_bot", "data")
+
+# Data file paths, joined once (plain str paths, no Path objects per call)
+_STATS_PATH = os.path.join(DATA_DIR, "runtime_stats.json")
+_WATCHER_PATH = os.path.join(DATA_DIR, "profit_watcher_state.json")
+_SPLIT_PATH = os.path.join(DATA_DIR, "split_state.json")
+_SPLIT_STATS_PATH = os.path.join(DATA_DIR, "split_stats.json")
+_RUNTIME_STATE_PATH = os.path.join(DATA_DIR, "runtime_state.json")
+_HISTORY_PATH = os.path.join(DATA_DIR, "price_history.json")
 
 # Expected keys for runtime statistics
 REQUIRED_STATS_KEYS = [
@@ -34,33 +76,294 @@ REQUIRED_STATS_KEYS = [
     "trade_count",
     "trigger_amount_usd",
 ]
+_REQUIRED_STATS_KEYS = frozenset(REQUIRED_STATS_KEYS)
+
+# Report line for valid stats, filled straight from the stats mapping
+_STATS_OK_TEMPLATE = (
+    "[OK] runtime_stats.json: profit={cumulative_profit_usd:.4f} "
+    "sell_trades={sell_trades_count} actual_splits={actual_splits_count} "
+    "bnb=${bnb_converted_usd:.2f} trades={trade_count}"
+)
+
+# Schema for runtime_stats.json: required keys plus the types the report formats
+STATS_SCHEMA = {
+    "type": "object",
+    "required": REQUIRED_STATS_KEYS,
+    "properties": {
+        "cumulative_profit_usd": {"type": "number"},
+        "bnb_converted_usd": {"type": "number"},
+        "sell_trades_count": {"type": "integer"},
+        "actual_splits_count": {"type": "integer"},
+        "trade_count": {"type": "integer"},
+        "trigger_amount_usd": {"type": "number"},
+    },
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _stats_validator() -> Any:
+    """STATS_SCHEMA compiled by fastjsonschema on first use (None if not installed)."""
+    fastjsonschema = _optional_module("fastjsonschema")
+    return fastjsonschema.compile(STATS_SCHEMA) if fastjsonschema is not None else None
+
+# Results of unchanged files are replayed from here instead of re-parsing
+CACHE_FILE = os.path.join(DATA_DIR, ".validate_cache.json")
+USE_CACHE = os.getenv("VALIDATE_CACHE", "1") != "0"
 
 # Warning thresholds
 MAX_INVENTORY_EMPTY_LOTS = 50
 MAX_PENDING_BUYS = 200
 MAX_PRICE_HISTORY_POINTS = 120000
 EMPTY_QTY_THRESHOLD = 1e-12
-
-
-def read_json_file(file_path: pathlib.Path) -> Optional[Dict[str, Any]]:
+# Smallest encoded history point: '{"t":<13-digit ms>,"p":0}'
+MIN_HISTORY_RECORD_BYTES = 25
+# Watcher state files at least this large are scanned for qty values on the raw bytes
+RAW_SCAN_MIN_BYTES = 1 << 20
+# The v3 inventory exactly as profit_watcher.write_state lays it out
+_V3_INVENTORY_RE = re.compile(
+    rb'"inventory"\s*:\s*\{\s*"qty"\s*:\s*\[([^\]]*)\]\s*,\s*"price"\s*:\s*\[([^\]]*)\]\s*\}'
+)
+_V3_SCHEMA_RE = re.compile(rb'"schema_version"\s*:\s*3\s*,')
+# Inventories at least this long are scanned with NumPy (below it the loop's early exit wins)
+NUMPY_MIN_LOTS = 1000
+
+
+def read_json_file(file_path: str, raw: Optional[bytes] = None) -> Optional[Dict[str, Any]]:
     """
     Safely read and parse a JSON file.
 
     Args:
         file_path: Path to the JSON file to read
+        raw: The file's bytes when the caller already read them (the file is
+            then not opened again)
 
     Returns:
-        Optional[Dict[str, Any]]: Parsed JSON data or None on error
+        Optional[Dict[str, Any]]: Parsed JSON data or None on error. Parsers
+        build exact dict/list roots, so callers dispatch on ``type(x) is dict``
+        rather than isinstance.
 
     Note:
-        Prints warning message on read/parse errors.
+        Prints warning message on read/parse errors. Reads bytes and parses
+        with orjson when installed (its JSONDecodeError subclasses json's).
+        Files are memory-mapped and handed to orjson directly, so no separate
+        copy of the file is held while parsing. Files written with
+        DOGE_STATS_FORMAT=msgpack (first byte >= 0x80) are decoded with
+        utils_stats.decode_payload.
     """
     try:
-        with open(file_path, "r", encoding="utf-8") as file:
-            return json.load(file)
-    except (json.JSONDecodeError, IOError, OSError) as e:
-        print(f"[WARN] Cannot read {file_path.name}: {e}")
+        if raw is None:
+            with open(file_path, "rb") as file:
+                if orjson is not None and os.fstat(file.fileno()).st_size:
+                    with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                        if mapped[0] < 0x80:
+                            with memoryview(mapped) as view:
+                                return orjson.loads(view)
+                raw = file.read()
+        if raw and raw[0] >= 0x80:
+            return _read_msgpack(file_path, raw)
+        return orjson.loads(raw) if orjson is not None else json.loads(raw)
+    except (ValueError, IOError, OSError) as e:  # ValueError covers JSON and msgpack decode errors
+        print(f"[WARN] Cannot read {os.path.basename(file_path)}: {e}")
+        return None
+
+
+def _read_msgpack(file_path: str, raw: bytes) -> Optional[Dict[str, Any]]:
+    """
+    Decode a msgpack data file the way the bot reads it.
+
+    Returns:
+        Optional[Dict[str, Any]]: Decoded data, or None (with a hint to export
+        the files as JSON) when msgpack is not installed
+    """
+    if _optional_module("msgpack") is None:
+        print(
+            f"[WARN] Cannot read {os.path.basename(file_path)}: msgpack file but msgpack is not "
+            f"installed; export as JSON with: python utils_stats.py --export-json DIR"
+        )
         return None
+    from utils_stats import decode_payload  # only msgpack runs pay for importing the bot module
+
+    return decode_payload(raw)
+
+
+# Snapshot of DATA_DIR taken by main(); None means "ask the filesystem"
+_DIR_ENTRIES: Optional[Dict[str, os.DirEntry]] = None
+
+
+def scan_data_dir() -> Dict[str, os.DirEntry]:
+    """List DATA_DIR once (one getdents pass); empty if it does not exist."""
+    try:
+        with os.scandir(DATA_DIR) as entries:
+            return {entry.name: entry for entry in entries}
+    except OSError:
+        return {}
+
+
+def _data_file_exists(path: str) -> bool:
+    """Existence check served from main()'s directory snapshot when available."""
+    if _DIR_ENTRIES is not None:
+        return os.path.basename(path) in _DIR_ENTRIES
+    return os.path.exists(path)
+
+
+def _data_file_size(path: str) -> Optional[int]:
+    """Size of a data file (from the snapshot's cached stat when available); None if unknown."""
+    try:
+        entry = _DIR_ENTRIES.get(os.path.basename(path)) if _DIR_ENTRIES is not None else None
+        if entry is not None:
+            return entry.stat().st_size
+        return os.path.getsize(path)
+    except OSError:
+        return None
+
+
+def _starts_with_array(file_path: str) -> bool:
+    """True when the first non-whitespace byte of the file opens a JSON array."""
+    try:
+        with open(file_path, "rb") as file:
+            return file.read(4096).lstrip().startswith(b"[")
+    except OSError:
+        return False
+
+
+# ijson events that start a value (one per array item)
+_VALUE_EVENTS = frozenset(("start_map", "start_array", "string", "number", "boolean", "null"))
+
+
+def count_container_items(
+    file_path: str, prefix: str, limit: int
+) -> Optional[Tuple[Optional[type], Optional[type], int]]:
+    """
+    Count the entries of a JSON container without materializing them.
+
+    With ijson the file is scanned as a token stream: array items and object
+    keys at ``prefix`` are counted as their start events arrive, and the scan
+    stops once the count exceeds ``limit``. Without ijson the file is loaded.
+
+    Args:
+        file_path: Path to the JSON file to scan
+        prefix: ijson prefix of the container ("" for the document root)
+        limit: Stop counting after ``limit + 1`` entries
+
+    Returns:
+        Optional[Tuple]: ``(root_type, container_type, count)`` where the types
+        are ``list``/``dict`` (or None for a scalar/missing container) and
+        ``count`` is capped at ``limit + 1``; None on read/parse errors
+    """
+    ijson = _optional_module("ijson")
+    if ijson is None:
+        data = read_json_file(file_path)
+        if data is None:
+            return None
+        node: Any = data
+        for part in filter(None, prefix.split(".")):
+            node = node.get(part) if type(node) is dict else None
+        node_type = type(node) if type(node) in (list, dict) else None
+        root_type = type(data) if type(data) in (list, dict) else None
+        return root_type, node_type, min(len(node) if node_type else 0, limit + 1)
+
+    item_prefix = f"{prefix}.item" if prefix else "item"
+    root_type = node_type = None
+    count = 0
+    try:
+        with open(file_path, "rb") as file:
+            for event_prefix, event, _ in ijson.parse(file):
+                if event_prefix == "" and root_type is None:
+                    root_type = {"start_array": list, "start_map": dict}.get(event)
+                    if root_type is None:
+                        break
+                if event_prefix == prefix:
+                    if node_type is None:
+                        node_type = {"start_array": list, "start_map": dict}.get(event)
+                        if node_type is None:
+                            break
+                    elif event == "map_key" and node_type is dict:
+                        count += 1
+                    elif event in ("end_array", "end_map"):
+                        break
+                elif node_type is list and event_prefix == item_prefix and event in _VALUE_EVENTS:
+                    count += 1
+                if count > limit:
+                    break
+    except (ijson.JSONError, IOError, OSError) as e:
+        print(f"[WARN] Cannot read {os.path.basename(file_path)}: {e}")
+        return None
+    return root_type, node_type, count
+
+
+def _split_usd(split_data: Dict[str, Any], name: str) -> float:
+    """
+    Read a split-state monetary field as float USD.
+
+    Args:
+        split_data: Parsed split_state.json contents
+        name: Field name without unit suffix (e.g. "bnb_pending")
+
+    Returns:
+        float: Value in USD, from ``<name>_micros`` (schema v2) or ``<name>_usd`` (v1)
+    """
+    micros = split_data.get(f"{name}_micros")
+    if micros is not None:
+        return int(micros) / 1_000_000
+    return float(split_data.get(f"{name}_usd", 0.0))
+
+
+@functools.lru_cache(maxsize=None)
+def _stats_decoder() -> Any:
+    """msgspec decoder that parses and type-checks runtime_stats.json in one pass (None if not installed)."""
+    msgspec = _optional_module("msgspec")
+    if msgspec is None:
+        return None
+
+    class RuntimeStats(msgspec.Struct):
+        cumulative_profit_usd: float
+        bnb_converted_usd: float
+        sell_trades_count: int
+        actual_splits_count: int
+        trade_count: int
+        trigger_amount_usd: float
+
+    return msgspec.json.Decoder(RuntimeStats)
+
+
+def _decode_stats_fast(raw: bytes) -> Optional[Dict[str, Any]]:
+    """
+    Parse and validate runtime stats with msgspec, without an intermediate dict of the file.
+
+    Args:
+        raw: Contents of runtime_stats.json
+
+    Returns:
+        Optional[Dict[str, Any]]: The required fields when the file is valid;
+        None when msgspec is not installed or the file needs the detailed path
+    """
+    decoder = _stats_decoder()
+    if decoder is None:
+        return None
+    try:
+        return _optional_module("msgspec").structs.asdict(decoder.decode(raw))
+    except _optional_module("msgspec").MsgspecError:
+        return None  # decode/validation errors are reported by the detailed path
+
+
+def _stats_schema_error(stats_data: Dict[str, Any]) -> Optional[str]:
+    """
+    Check runtime stats against STATS_SCHEMA.
+
+    Returns:
+        Optional[str]: None when valid, else the first problem found (only
+        missing keys are checked when fastjsonschema is not installed)
+    """
+    validate = _stats_validator()
+    if validate is not None:
+        try:
+            validate(stats_data)
+        except _optional_module("fastjsonschema").JsonSchemaException as e:
+            return e.message
+        return None
+    if not _REQUIRED_STATS_KEYS.issubset(stats_data):
+        return "missing required keys"
+    return None
 
 
 def validate_runtime_stats() -> None:
@@ -70,64 +373,169 @@ def validate_runtime_stats() -> None:
     Checks for required keys and reports current statistics.
     Reports errors for missing or malformed files.
     """
-    stats_path = DATA_DIR / "runtime_stats.json"
-    stats_data = read_json_file(stats_path)
+    stats_path = _STATS_PATH
+
+    # msgspec decodes straight into a typed struct; anything it rejects (or a
+    # missing msgspec) goes through the dict path, which explains the problem.
+    # The bytes read for msgspec are handed to that path, not read twice.
+    raw = None
+    if _stats_decoder() is not None:
+        try:
+            with open(stats_path, "rb") as file:
+                raw = file.read()
+        except OSError:
+            pass  # reported by read_json_file below
+    stats_data = _decode_stats_fast(raw) if raw is not None else None
+    if stats_data is None:
+        stats_data = read_json_file(stats_path, raw)
+
+        if type(stats_data) is not dict:
+            print("[ERR] runtime_stats.json missing or malformed")
+            return
+
+        # One compiled schema call on the happy path; per-key details only on failure
+        schema_error = _stats_schema_error(stats_data)
+        if schema_error is not None:
+            missing = _REQUIRED_STATS_KEYS.difference(stats_data)
+            missing_keys = [key for key in REQUIRED_STATS_KEYS if key in missing]  # stable order
+            for key in missing_keys:
+                print(f"[WARN] runtime_stats.json missing key: {key}")
+            if not missing_keys:
+                print(f"[WARN] runtime_stats.json invalid: {schema_error}")
+            return
+
+    print(_STATS_OK_TEMPLATE.format_map(stats_data))
+
+
+def _count_empty_lots(qty_values: Any, lot_count: int) -> int:
+    """
+    Count quantities at or below EMPTY_QTY_THRESHOLD.
 
-    if not isinstance(stats_data, dict):
-        print("[ERR] runtime_stats.json missing or malformed")
-        return
+    Args:
+        qty_values: A list or iterable of numbers (or numeric bytes/str)
+        lot_count: Number of values, used to pick the NumPy path
 
-    missing_keys = []
-    for key in REQUIRED_STATS_KEYS:
-        if key not in stats_data:
-            missing_keys.append(key)
-
-    if missing_keys:
-        for key in missing_keys:
-            print(f"[WARN] runtime_stats.json missing key: {key}")
-    else:
-        profit = stats_data["cumulative_profit_usd"]
-        sell_trades = stats_data["sell_trades_count"]
-        actual_splits = stats_data["actual_splits_count"]
-        bnb = stats_data["bnb_converted_usd"]
-        trades = stats_data["trade_count"]
+    Returns:
+        int: Empty-lot count; without NumPy it stops just past
+        MAX_INVENTORY_EMPTY_LOTS, since the verdict does not change after that
+    """
+    np = _optional_module("numpy") if lot_count >= NUMPY_MIN_LOTS else None
+    if np is not None:
+        if type(qty_values) is list:
+            qtys = np.asarray(qty_values, dtype=np.float64)  # contiguous column, no per-lot work
+        else:
+            qtys = np.fromiter(qty_values, dtype=np.float64, count=lot_count)
+        return int(np.count_nonzero(qtys <= EMPTY_QTY_THRESHOLD))
 
-        print(
-            f"[OK] runtime_stats.json: profit={profit:.4f} sell_trades={sell_trades} "
-            f"actual_splits={actual_splits} bnb=${bnb:.2f} trades={trades}"
-        )
+    empty_count = 0
+    for qty in qty_values:
+        if float(qty) <= EMPTY_QTY_THRESHOLD:
+            empty_count += 1
+            if empty_count > MAX_INVENTORY_EMPTY_LOTS:
+                break
+    return empty_count
 
 
-def validate_profit_watcher_state() -> None:
-    """
-    Validate the profit watcher state file.
+def _number_column_length(column: bytes) -> Optional[int]:
+    """Item count of a JSON array body of plain numbers; None if it may hold strings or objects."""
+    if b'"' in column or b"{" in column:
+        return None
+    return column.count(b",") + 1 if column.strip() else 0
+
 
-    Checks inventory structure and reports warnings for empty lots.
+def _scan_empty_lots_raw(watcher_path: str) -> Optional[int]:
     """
-    watcher_path = DATA_DIR / "profit_watcher_state.json"
-    watcher_data = read_json_file(watcher_path)
+    Count empty lots by parsing only the qty column out of the raw JSON bytes.
 
-    if not isinstance(watcher_data, dict):
-        print("[ERR] profit_watcher_state.json missing/malformed")
-        return
+    The file is memory-mapped and matched with precompiled byte regexes. Only
+    a schema v3 file whose "inventory" columns sit at the top level qualifies:
+    everything before the match must be the root object's scalar members,
+    including "schema_version": 3. The qty and price columns must have the
+    same length; then just the qty slice is parsed. No dicts or strings are
+    built for prices or other fields.
+
+    Returns:
+        Optional[int]: Empty-lot count, or None whenever the file does not
+        have that exact layout (the caller then parses it and reports
+        structural problems)
+    """
+    try:
+        with open(watcher_path, "rb") as file, \
+                mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            inventory = _V3_INVENTORY_RE.search(data)
+            if (
+                inventory is None
+                or data.find(b'"inventory"', inventory.end()) != -1  # a later duplicate key wins
+                or not data[-64:].rstrip().endswith(b"}")
+            ):
+                return None
+            head = data[:inventory.start()].strip()
+            # Root members before "inventory" must be scalars, so the match is top level
+            if (
+                not head.startswith(b"{")
+                or not head.endswith((b"{", b","))
+                or b"{" in head[1:]
+                or b"[" in head
+                or _V3_SCHEMA_RE.search(head) is None
+            ):
+                return None
+            qty_column, price_column = inventory.group(1), inventory.group(2)
+            qty_count = _number_column_length(qty_column)
+            if qty_count is None or qty_count != _number_column_length(price_column):
+                return None
+            raw = b"[" + qty_column + b"]"
+            values = orjson.loads(raw) if orjson is not None else json.loads(raw)
+    except (OSError, ValueError):  # includes JSONDecodeError and mmap of an empty file
+        return None
+    try:
+        return _count_empty_lots(values, len(values))
+    except (TypeError, ValueError):
+        return None  # not plain numbers; let the full parse report it
 
-    inventory = watcher_data.get("inventory", [])
-    if not isinstance(inventory, list):
-        print("[ERR] watcher.inventory not a list")
-        return
 
-    # Check for empty lots (quantity approximately zero)
-    empty_lots = [lot for lot in inventory if float(lot.get("qty", 0.0)) <= EMPTY_QTY_THRESHOLD]
+def validate_profit_watcher_state() -> None:
+    """
+    Validate the profit watcher state file.
 
-    if empty_lots:
-        empty_count = len(empty_lots)
-        if empty_count > MAX_INVENTORY_EMPTY_LOTS:
-            print(
-                f"[WARN] watcher.inventory contains {empty_count} empty lots "
-                f"(qty≈0) - consider cleanup"
-            )
+    Checks inventory structure and reports warnings for empty lots. Schema v3
+    files of RAW_SCAN_MIN_BYTES or more have only their qty column parsed.
+    """
+    watcher_path = _WATCHER_PATH
+
+    empty_count = None
+    size = _data_file_size(watcher_path)
+    if size is not None and size >= RAW_SCAN_MIN_BYTES:
+        empty_count = _scan_empty_lots_raw(watcher_path)
+
+    if empty_count is None:
+        watcher_data = read_json_file(watcher_path)
+
+        if type(watcher_data) is not dict:
+            print("[ERR] profit_watcher_state.json missing/malformed")
+            return
+
+        inventory = watcher_data.get("inventory", [])
+        if type(inventory) is dict:
+            # Schema v3: columns {"qty": [...], "price": [...]}
+            qty_column: Any = inventory.get("qty", [])
+            if type(qty_column) is not list or len(qty_column) != len(inventory.get("price") or []):
+                print("[ERR] watcher.inventory columns malformed")
+                return
+            empty_count = _count_empty_lots(qty_column, len(qty_column))
+        elif type(inventory) is list:
+            # Schemas v1-2: list of {"qty", "price"} lots
+            empty_count = _count_empty_lots((lot.get("qty", 0.0) for lot in inventory), len(inventory))
         else:
-            print(f"[INFO] watcher.inventory contains {empty_count} empty lots (qty≈0)")
+            print("[ERR] watcher.inventory not a list or columns")
+            return
+
+    if empty_count > MAX_INVENTORY_EMPTY_LOTS:
+        print(
+            f"[WARN] watcher.inventory contains >{MAX_INVENTORY_EMPTY_LOTS} empty lots "
+            f"(qty≈0) - consider cleanup"
+        )
+    elif empty_count:
+        print(f"[INFO] watcher.inventory contains {empty_count} empty lots (qty≈0)")
 
 
 def validate_split_state() -> None:
@@ -136,19 +544,29 @@ def validate_split_state() -> None:
 
     Checks for required fields and reports current split statistics.
     """
-    split_path = DATA_DIR / "split_state.json"
+    split_path = _SPLIT_PATH
     split_data = read_json_file(split_path)
 
-    if not isinstance(split_data, dict):
-        print("[ERR] split_state.json missing/malformed (migration from state.json needed?)")
+    if type(split_data) is not dict:
+        if _data_file_exists(split_path):
+            print("[ERR] split_state.json malformed")
+        else:
+            print("[ERR] split_state.json missing (migration from state.json needed?)")
         return
 
+    # Cumulative totals live in split_stats.json since split schema v3
+    stats_path = _SPLIT_STATS_PATH
+    if _data_file_exists(stats_path):
+        split_stats = read_json_file(stats_path)
+        if type(split_stats) is dict:
+            split_data = {**split_data, **split_stats}
+
     # Extract split state values with safe defaults
-    accumulator = float(split_data.get("split_accumulator_usd", 0.0))
-    bnb_pending = float(split_data.get("bnb_pending_usd", 0.0))
-    reinvest_pool = float(split_data.get("reinvest_pool_usd", 0.0))
-    total_bnb = float(split_data.get("total_sent_to_bnb_usd", 0.0))
-    total_reinvest = float(split_data.get("total_reinvested_usd", 0.0))
+    accumulator = _split_usd(split_data, "split_accumulator")
+    bnb_pending = _split_usd(split_data, "bnb_pending")
+    reinvest_pool = _split_usd(split_data, "reinvest_pool")
+    total_bnb = _split_usd(split_data, "total_sent_to_bnb")
+    total_reinvest = _split_usd(split_data, "total_reinvested")
 
     print(
         f"[OK] split_state.json: acc={accumulator:.4f} bnb_pending=${bnb_pending:.2f} "
@@ -163,22 +581,22 @@ def validate_runtime_state() -> None:
 
     Checks for large pending_buys collections that may need pruning.
     """
-    runtime_path = DATA_DIR / "runtime_state.json"
+    runtime_path = _RUNTIME_STATE_PATH
 
-    if not runtime_path.exists():
+    if not _data_file_exists(runtime_path):
         print("[INFO] runtime_state.json not present (OK if bot writes elsewhere)")
         return
 
-    runtime_data = read_json_file(runtime_path)
-    if not isinstance(runtime_data, dict):
+    # Count pending_buys keys from the token stream, stopping past the threshold
+    scan = count_container_items(runtime_path, "pending_buys", MAX_PENDING_BUYS)
+    if scan is None or scan[0] is not dict:
         print("[ERR] runtime_state.json malformed")
         return
 
-    # Check for large pending_buys collection
-    pending_buys = runtime_data.get("pending_buys", {})
-    if isinstance(pending_buys, dict) and len(pending_buys) > MAX_PENDING_BUYS:
+    _, pending_type, pending_count = scan
+    if pending_type is dict and pending_count > MAX_PENDING_BUYS:
         print(
-            f"[WARN] runtime_state.json pending_buys large: {len(pending_buys)} "
+            f"[WARN] runtime_state.json pending_buys large: >{MAX_PENDING_BUYS} "
             f"(consider pruning)"
         )
 
@@ -189,40 +607,170 @@ def validate_price_history() -> None:
 
     Checks for excessively large history files that may need rotation.
     """
-    history_path = DATA_DIR / "price_history.json"
+    history_path = _HISTORY_PATH
 
-    if not history_path.exists():
+    if not _data_file_exists(history_path):
         print("[INFO] price_history.json missing (OK if dashboard is the only producer)")
         return
 
-    history_data = read_json_file(history_path)
-    if not isinstance(history_data, list):
+    # A file smaller than MAX_PRICE_HISTORY_POINTS minimal records cannot hold
+    # too many points; only its root type is checked, without parsing
+    size = _data_file_size(history_path)
+    if size is not None and size < MAX_PRICE_HISTORY_POINTS * MIN_HISTORY_RECORD_BYTES:
+        if not _starts_with_array(history_path):
+            print("[ERR] price_history.json not a list")
+        return
+
+    # Stream-count the points instead of loading the whole list
+    scan = count_container_items(history_path, "", MAX_PRICE_HISTORY_POINTS)
+    if scan is None or scan[0] is not list:
         print("[ERR] price_history.json not a list")
         return
 
-    if len(history_data) > MAX_PRICE_HISTORY_POINTS:
+    if scan[2] > MAX_PRICE_HISTORY_POINTS:
         print(
-            f"[WARN] price_history.json very large: {len(history_data)} points; "
+            f"[WARN] price_history.json very large: >{MAX_PRICE_HISTORY_POINTS} points; "
             f"consider rotation"
         )
 
 
+# Each validator with the files its result depends on
+VALIDATORS = (
+    (validate_runtime_stats, ("runtime_stats.json",)),
+    (validate_profit_watcher_state, ("profit_watcher_state.json",)),
+    (validate_split_state, ("split_state.json", "split_stats.json")),
+    (validate_runtime_state, ("runtime_state.json",)),
+    (validate_price_history, ("price_history.json",)),
+)
+
+
+def _file_signature(entries: Dict[str, os.DirEntry], name: str) -> Optional[list[int]]:
+    """[mtime_ns, size] of a data file, or None when it does not exist."""
+    entry = entries.get(name)
+    if entry is None:
+        return None
+    try:
+        stat_result = entry.stat()  # cached on the DirEntry after the first call
+    except OSError:
+        return None
+    return [stat_result.st_mtime_ns, stat_result.st_size]
+
+
+def load_validate_cache() -> Dict[str, Any]:
+    """
+    Load the validation result cache.
+
+    Returns:
+        Dict[str, Any]: ``{validator_name: {"sig": [...], "output": str}}``;
+        empty when disabled, missing or unreadable
+    """
+    if not USE_CACHE:
+        return {}
+    try:
+        with open(CACHE_FILE, "rb") as file:
+            cache = json.loads(file.read())
+    except (OSError, ValueError):
+        return {}
+    return cache if type(cache) is dict else {}
+
+
+def save_validate_cache(cache: Dict[str, Any]) -> None:
+    """Write the validation result cache atomically (best effort)."""
+    if not USE_CACHE:
+        return
+    temp_file = CACHE_FILE + ".tmp"
+    try:
+        with open(temp_file, "w", encoding="utf-8") as file:
+            file.write(json.dumps(cache))
+        os.replace(temp_file, CACHE_FILE)
+    except OSError:
+        pass
+
+
+def _is_cacheable(output: str) -> bool:
+    """Only clean results are replayed; errors and read failures are re-checked."""
+    return "[ERR]" not in output and "Cannot read" not in output
+
+
+class _ThreadBufferedStdout(io.TextIOBase):
+    """stdout stand-in that sends each thread's writes to that thread's buffer."""
+
+    def __init__(self, fallback: Any) -> None:
+        self._fallback = fallback
+        self._local = threading.local()
+
+    def write(self, text: str) -> int:
+        buffer = getattr(self._local, "buffer", None)
+        return (buffer if buffer is not None else self._fallback).write(text)
+
+    def run(self, validator: Any) -> str:
+        """
+        Run a validator and return everything it printed.
+
+        An exception (e.g. an unexpected value type in a data file) is
+        reported as an [ERR] line in that validator's output, so the other
+        validators' results are still printed.
+        """
+        buffer = self._local.buffer = io.StringIO()
+        try:
+            validator()
+        except Exception as e:
+            buffer.write(f"[ERR] {validator.__name__} failed: {type(e).__name__}: {e}\n")
+        finally:
+            self._local.buffer = None
+        return buffer.getvalue()
+
+
 def main() -> None:
     """
     Run all data validation checks.
 
     Performs comprehensive validation of all bot data files and reports
-    any issues found.
+    any issues found. A validator whose files have the same mtime and size
+    as on the previous run replays its cached output without reading them;
+    the rest run concurrently. The whole report is written to stdout once,
+    at the end, in the fixed validator order.
     """
-    print(f"[INFO] Validating data directory: {DATA_DIR}")
-
-    validate_runtime_stats()
-    validate_profit_watcher_state()
-    validate_split_state()
-    validate_runtime_state()
-    validate_price_history()
+    global _DIR_ENTRIES
+    report = [f"[INFO] Validating data directory: {DATA_DIR}\n"]
+
+    # One directory listing answers every existence/mtime question below
+    entries = _DIR_ENTRIES = scan_data_dir()
+    cache = load_validate_cache()
+    new_cache: Dict[str, Any] = {}
+    outputs: Dict[str, str] = {}
+    pending = []
+    for validator, names in VALIDATORS:
+        signature = [_file_signature(entries, name) for name in names]
+        entry = cache.get(validator.__name__)
+        if type(entry) is dict and entry.get("sig") == signature:
+            new_cache[validator.__name__] = entry
+            outputs[validator.__name__] = entry["output"]
+        else:
+            pending.append((validator, names, signature))
 
-    print("[DONE] Data validation complete")
+    # Validators are independent: run them together so their file reads and
+    # C-level parsing overlap; each one's prints land in its own buffer
+    capture = _ThreadBufferedStdout(sys.stdout)
+    try:
+        with contextlib.redirect_stdout(capture), \
+                ThreadPoolExecutor(max_workers=len(pending) or 1) as pool:
+            results = list(pool.map(capture.run, [validator for validator, _, _ in pending]))
+    finally:
+        _DIR_ENTRIES = None
+
+    for (validator, _, signature), output in zip(pending, results):
+        outputs[validator.__name__] = output
+        if _is_cacheable(output):
+            new_cache[validator.__name__] = {"sig": signature, "output": output}
+
+    # Report in the fixed validator order, whether replayed or freshly run
+    report.extend(outputs[validator.__name__] for validator, _ in VALIDATORS)
+    save_validate_cache(new_cache)
+
+    report.append("[DONE] Data validation complete\n")
+    sys.stdout.write("".join(report))
+    sys.stdout.flush()
 
 
 if __name__ == "__main__":